@@ -3,10 +3,13 @@
 负责智能体的创建、注册和管理
 """
 
-from typing import Dict, List, Optional, Type
+from typing import Dict, List, Optional, Tuple, Type
 
-from ai_town.agents.base_agent import BaseAgent
+import numpy as np
+
+from ai_town.agents.base_agent import BaseAgent, PositionView
 from ai_town.agents.characters import Alice, Bob, Charlie
+from ai_town.environment.spatial import within_radius_mask
 
 
 class AgentRegistry:
@@ -14,11 +17,13 @@ class AgentRegistry:
 
     _agents: Dict[str, Type[BaseAgent]] = {}
     _default_agents = {"alice": Alice, "bob": Bob, "charlie": Charlie}
+    _available_cache: Optional[Tuple[str, ...]] = None
 
     @classmethod
     def register_agent(cls, agent_id: str, agent_class: Type[BaseAgent]):
         """注册新的智能体类型"""
         cls._agents[agent_id] = agent_class
+        cls._available_cache = None
 
     @classmethod
     def get_agent_class(cls, agent_id: str) -> Optional[Type[BaseAgent]]:
@@ -32,9 +37,11 @@ class AgentRegistry:
     @classmethod
     def get_available_agents(cls) -> List[str]:
         """获取所有可用的智能体ID"""
-        all_agents = set(cls._default_agents.keys())
-        all_agents.update(cls._agents.keys())
-        return list(all_agents)
+        if cls._available_cache is None:
+            all_agents = set(cls._default_agents.keys())
+            all_agents.update(cls._agents.keys())
+            cls._available_cache = tuple(all_agents)
+        return list(cls._available_cache)
 
     @classmethod
     def create_agent(cls, agent_id: str) -> Optional[BaseAgent]:
@@ -46,12 +53,38 @@ class AgentRegistry:
 
 
 class AgentManager:
-    """智能体管理器"""
+    """
+    智能体管理器
+
+    所有受管智能体的数值状态以结构数组（SoA）形式集中保存：
+    - _positions: (容量, 2) 的坐标数组
+    - _areas / _active: 与坐标行对齐的区域、占用标记数组
+    - _energy / _mood / _state_codes: 能量、心情与状态编码
+    智能体的 position 为指向对应行的 PositionView，energy / mood / state 属性直接读写对应行。
+    另维护区域、职业到智能体的索引，随加入、移除以及区域、职业变化增量更新。
+    """
+
+    _INITIAL_CAPACITY = 16
 
     def __init__(self):
         self.agents: Dict[str, BaseAgent] = {}
         self.registry = AgentRegistry()
 
+        # 坐标存储
+        self._positions = np.zeros((self._INITIAL_CAPACITY, 2), dtype=np.float64)
+        self._areas = np.full(self._INITIAL_CAPACITY, None, dtype=object)
+        self._active = np.zeros(self._INITIAL_CAPACITY, dtype=bool)
+        self._energy = np.zeros(self._INITIAL_CAPACITY, dtype=np.float64)
+        self._mood = np.zeros(self._INITIAL_CAPACITY, dtype=np.float64)
+        self._state_codes = np.zeros(self._INITIAL_CAPACITY, dtype=np.int8)
+        self._row_agents: List[Optional[BaseAgent]] = [None] * self._INITIAL_CAPACITY
+        self._pos_index: Dict[str, int] = {}
+        self._free_rows: List[int] = list(range(self._INITIAL_CAPACITY - 1, -1, -1))
+
+        # 区域 / 职业 -> {agent_id: agent}（字典兼作有序集合）
+        self._by_area: Dict[str, Dict[str, BaseAgent]] = {}
+        self._by_occupation: Dict[str, Dict[str, BaseAgent]] = {}
+
     def create_agent(self, agent_id: str) -> Optional[BaseAgent]:
         """创建并添加智能体"""
         if agent_id in self.agents:
@@ -59,20 +92,112 @@ class AgentManager:
 
         agent = self.registry.create_agent(agent_id)
         if agent:
-            self.agents[agent_id] = agent
+            self.add_agent(agent)
         return agent
 
     def add_agent(self, agent: BaseAgent):
         """添加已创建的智能体"""
+        previous = self.agents.get(agent.agent_id)
+        if previous is not None and previous is not agent:
+            self._release_agent(previous)
         self.agents[agent.agent_id] = agent
+        self._bind_agent(agent)
 
     def remove_agent(self, agent_id: str) -> bool:
         """移除智能体"""
         if agent_id in self.agents:
+            self._release_agent(self.agents[agent_id])
             del self.agents[agent_id]
             return True
         return False
 
+    def _bind_agent(self, agent: BaseAgent):
+        """将智能体的位置与数值状态写入存储，并把 agent.position 替换为视图"""
+        current = agent.position
+        if isinstance(current, PositionView) and current._store is self:
+            return
+        if isinstance(current, PositionView):
+            # 已由其他管理器托管：以本管理器为准迁移过来
+            current._store._release_agent(agent)
+            current = agent.position
+
+        if not self._free_rows:
+            self._grow()
+        row = self._free_rows.pop()
+        self._positions[row] = (current.x, current.y)
+        self._areas[row] = current.area
+        self._active[row] = True
+        self._energy[row] = agent.energy
+        self._mood[row] = agent.mood
+        self._state_codes[row] = agent.state
+        self._row_agents[row] = agent
+        self._pos_index[agent.agent_id] = row
+        agent._position = PositionView(self, row)
+        agent._store = self
+        agent._row = row
+
+        self._by_area.setdefault(current.area, {})[agent.agent_id] = agent
+        self._by_occupation.setdefault(agent.occupation, {})[agent.agent_id] = agent
+
+    def _release_agent(self, agent: BaseAgent):
+        """释放智能体占用的存储行，并把位置与数值状态还原到智能体自身"""
+        view = agent.position
+        if not isinstance(view, PositionView) or view._store is not self:
+            return
+        row = view._index
+        agent._position = view.copy()
+        state, energy, mood = agent.state, agent.energy, agent.mood
+        agent._store = None
+        agent._row = -1
+        agent.state, agent.energy, agent.mood = state, energy, mood
+        self._discard_from_index(self._by_area, self._areas[row], agent.agent_id)
+        self._discard_from_index(self._by_occupation, agent.occupation, agent.agent_id)
+        self._areas[row] = None
+        self._active[row] = False
+        self._row_agents[row] = None
+        self._pos_index.pop(agent.agent_id, None)
+        self._free_rows.append(row)
+
+    def _grow(self):
+        """存储容量不足时按倍数扩容"""
+        old_capacity = len(self._positions)
+        new_capacity = old_capacity * 2
+        self._positions = np.resize(self._positions, (new_capacity, 2))
+        self._positions[old_capacity:] = 0.0
+        self._areas = np.resize(self._areas, new_capacity)
+        self._areas[old_capacity:] = None
+        self._active = np.resize(self._active, new_capacity)
+        self._active[old_capacity:] = False
+        self._energy = np.resize(self._energy, new_capacity)
+        self._mood = np.resize(self._mood, new_capacity)
+        self._state_codes = np.resize(self._state_codes, new_capacity)
+        self._row_agents.extend([None] * (new_capacity - old_capacity))
+        self._free_rows.extend(range(new_capacity - 1, old_capacity - 1, -1))
+
+    def _set_area(self, row: int, area: str):
+        """更新某行的区域，并同步区域索引（由 PositionView 调用）"""
+        old_area = self._areas[row]
+        self._areas[row] = area
+        if old_area != area:
+            agent = self._row_agents[row]
+            self._discard_from_index(self._by_area, old_area, agent.agent_id)
+            self._by_area.setdefault(area, {})[agent.agent_id] = agent
+
+    def _on_occupation_change(self, agent: BaseAgent, old: str, new: str):
+        """智能体职业变化时同步职业索引"""
+        if old != new:
+            self._discard_from_index(self._by_occupation, old, agent.agent_id)
+            self._by_occupation.setdefault(new, {})[agent.agent_id] = agent
+
+    @staticmethod
+    def _discard_from_index(index: Dict[str, Dict[str, BaseAgent]], key: str, agent_id: str):
+        """从索引中移除智能体，并清理空桶"""
+        bucket = index.get(key)
+        if bucket is not None:
+            bucket.pop(agent_id, None)
+            if not bucket:
+                del index[key]
+
     def get_agent(self, agent_id: str) -> Optional[BaseAgent]:
         """获取智能体"""
         return self.agents.get(agent_id)
@@ -99,11 +224,17 @@ class AgentManager:
 
     def get_agents_by_area(self, area: str) -> List[BaseAgent]:
         """获取指定区域的所有智能体"""
-        return [agent for agent in self.agents.values() if agent.position.area == area]
+        return list(self._by_area.get(area, {}).values())
 
     def get_agents_by_occupation(self, occupation: str) -> List[BaseAgent]:
         """获取指定职业的所有智能体"""
-        return [agent for agent in self.agents.values() if agent.occupation == occupation]
+        return list(self._by_occupation.get(occupation, {}).values())
+
+    def get_agents_within(self, x: float, y: float, radius: float) -> List[BaseAgent]:
+        """获取以 (x, y) 为圆心、radius 为半径范围内的所有智能体"""
+        in_range = within_radius_mask(x, y, self._positions, radius)
+        rows = np.flatnonzero(in_range & self._active)
+        return [self._row_agents[row] for row in rows]
 
 
 # 全局智能体管理器实例
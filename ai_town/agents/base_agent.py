@@ -4,56 +4,393 @@
 """
 
 import asyncio
+import os
+import random
 import uuid
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from collections import deque
 from datetime import datetime
-from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from enum import IntEnum
+from functools import lru_cache, wraps
+from math import hypot, sqrt
+from types import MappingProxyType
+from typing import Any, Callable, Deque, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+import numpy as np
 
 from ai_town.agents.memory.memory_stream import MemoryStream
 from ai_town.agents.planning.planner import ActionPlanner
 from ai_town.core.time_manager import GameTime
+from ai_town.environment.spatial import (
+    VECTORIZE_THRESHOLD,
+    positions_to_array,
+    update_energy_mood,
+    within_radius_mask,
+    within_range,
+)
 from ai_town.events.event_registry import event_registry
 
 
-class AgentState(Enum):
-    """智能体状态"""
+class AgentState(IntEnum):
+    """智能体状态（内部以整数编码，序列化时使用 label）"""
+
+    IDLE = 0
+    MOVING = 1
+    TALKING = 2
+    WORKING = 3
+    SLEEPING = 4
+    EATING = 5
+    SOCIALIZING = 6
+
+    @property
+    def label(self) -> str:
+        """状态的字符串名称，如 "idle" """
+        return _STATE_LABELS[self]
 
-    IDLE = "idle"
-    MOVING = "moving"
-    TALKING = "talking"
-    WORKING = "working"
-    SLEEPING = "sleeping"
-    EATING = "eating"
-    SOCIALIZING = "socializing"
+    @classmethod
+    def from_label(cls, label: str) -> "AgentState":
+        """由字符串名称解析状态"""
+        state = _STATE_BY_LABEL.get(label)
+        if state is not None:
+            return state
+        try:
+            return _STATE_BY_LABEL[label.lower()]
+        except (KeyError, AttributeError):
+            raise ValueError(f"{label!r} is not a valid {cls.__name__}") from None
+
+
+_STATES = tuple(AgentState)
+_STATE_LABELS = tuple(state.name.lower() for state in AgentState)
+_STATE_BY_LABEL: Dict[str, AgentState] = dict(zip(_STATE_LABELS, _STATES))
 
 
-@dataclass
 class Position:
     """位置信息"""
 
-    x: float
-    y: float
-    area: str = "unknown"
+    __slots__ = ("x", "y", "area")
+
+    def __init__(self, x: float, y: float, area: str = "unknown"):
+        self.x = x
+        self.y = y
+        self.area = area
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(x={self.x!r}, y={self.y!r}, area={self.area!r})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Position):
+            return NotImplemented
+        return (self.x, self.y, self.area) == (other.x, other.y, other.area)
+
+    __hash__ = None
 
     def distance_to(self, other: "Position") -> float:
         """计算到另一个位置的距离"""
-        return ((self.x - other.x) ** 2 + (self.y - other.y) ** 2) ** 0.5
+        return hypot(self.x - other.x, self.y - other.y)
+
+    def distance_sq_to(self, other: "Position") -> float:
+        """计算到另一个位置的距离平方（仅做比较时无需开方）"""
+        dx = self.x - other.x
+        dy = self.y - other.y
+        return dx * dx + dy * dy
+
+    def within_radius(self, other: "Position", radius: float) -> bool:
+        """判断另一个位置是否在给定半径内"""
+        return self.distance_sq_to(other) <= radius * radius
+
+    def shift(self, dx: float, dy: float):
+        """按偏移量平移"""
+        self.x += dx
+        self.y += dy
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可序列化的字典"""
+        return {"x": self.x, "y": self.y, "area": self.area}
+
+    def copy(self) -> "Position":
+        """复制为独立的位置对象"""
+        return Position(self.x, self.y, self.area)
+
+
+class PositionView(Position):
+    """
+    位置视图
+
+    不自行保存坐标，而是读写坐标存储（如 AgentManager）中的某一行，
+    使所有智能体的坐标集中在一块连续数组中，便于批量空间查询。
+    """
+
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store, index: int):
+        self._store = store
+        self._index = index
+
+    @property
+    def x(self) -> float:
+        return float(self._store._positions[self._index, 0])
+
+    @x.setter
+    def x(self, value: float):
+        self._store._positions[self._index, 0] = value
+
+    @property
+    def y(self) -> float:
+        return float(self._store._positions[self._index, 1])
+
+    @y.setter
+    def y(self, value: float):
+        self._store._positions[self._index, 1] = value
+
+    @property
+    def area(self) -> str:
+        return self._store._areas[self._index]
+
+    @area.setter
+    def area(self, value: str):
+        self._store._set_area(self._index, value)
+
+    def shift(self, dx: float, dy: float):
+        """按偏移量平移（对存储行做一次向量加法）"""
+        self._store._positions[self._index] += (dx, dy)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可序列化的字典（一次读取整行坐标）"""
+        x, y = self._store._positions[self._index].tolist()
+        return {"x": x, "y": y, "area": self._store._areas[self._index]}
 
 
-@dataclass
 class Observation:
     """观察信息"""
 
-    timestamp: datetime
-    observer_id: str
-    event_type: str
-    description: str
-    location: Position
-    participants: List[str] = field(default_factory=list)
-    importance: float = 1.0
-    metadata: Dict[str, Any] = field(default_factory=dict)
+    # 按访问频率排列：记忆流筛选常用的字段在前，较少访问的容器字段在后
+    __slots__ = (
+        "timestamp",
+        "importance",
+        "observer_id",
+        "event_type",
+        "description",
+        "location",
+        "participants",
+        "metadata",
+    )
+
+    def __init__(
+        self,
+        timestamp: datetime,
+        observer_id: str,
+        event_type: str,
+        description: str,
+        location: Position,
+        participants: Optional[List[str]] = None,
+        importance: float = 1.0,
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        self.timestamp = timestamp
+        self.observer_id = observer_id
+        self.event_type = event_type
+        self.description = description
+        self.location = location
+        self.participants = participants if participants is not None else []
+        self.importance = importance
+        self.metadata = metadata if metadata is not None else {}
+
+    # 对象池复用时原地重写全部字段
+    reset = __init__
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Observation):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None
+
+
+class ObservationPool:
+    """
+    Observation 对象池
+
+    智能体自身产生的观察写入记忆流后即不再使用（记忆流会复制所需字段），
+    归还到池中供下一次感知复用，减少每个时间步的对象分配。
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._free: Deque[Observation] = deque()
+
+    def acquire(
+        self,
+        timestamp: datetime,
+        observer_id: str,
+        event_type: str,
+        description: str,
+        location: Position,
+        participants: Optional[List[str]] = None,
+        importance: float = 1.0,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Observation:
+        """取出一个观察对象（池为空时新建）"""
+        if not self._free:
+            return Observation(
+                timestamp,
+                observer_id,
+                event_type,
+                description,
+                location,
+                participants,
+                importance,
+                metadata,
+            )
+        obs = self._free.pop()
+        obs.reset(
+            timestamp,
+            observer_id,
+            event_type,
+            description,
+            location,
+            participants,
+            importance,
+            metadata,
+        )
+        return obs
+
+    def release(self, obs: Observation):
+        """归还观察对象，调用方此后不应再使用它"""
+        if len(self._free) >= self.max_size:
+            return
+        # 断开对外部对象的引用（记忆中仍持有参与者列表等，不能原地清空）
+        obs.location = None
+        obs.participants = None
+        obs.metadata = None
+        self._free.append(obs)
+
+
+_obs_pool = ObservationPool()
+
+
+class ActionDescriptor(NamedTuple):
+    """动作类型的解析结果"""
+
+    executor: Optional[Callable[..., Any]]  # 未绑定的协程执行函数，None 表示走通用执行
+    event_id: str  # 标准化事件ID
+    target_state: Optional[AgentState]  # 执行前设置的状态，None 表示保持原状态
+
+
+def _as_coroutine_function(func: Callable[..., Any]) -> Callable[..., Any]:
+    """把同步执行方法包装为协程函数（类创建时包装一次，执行时统一 await）"""
+
+    @wraps(func)
+    async def wrapper(self, world_state):
+        return func(self, world_state)
+
+    return wrapper
+
+
+# 事件ID -> 状态的确定映射
+_FIXED_EVENT_STATES = {
+    "movement": AgentState.MOVING,
+    "conversation": AgentState.TALKING,
+    "socialize": AgentState.SOCIALIZING,
+    "work": AgentState.WORKING,
+    "sleeping": AgentState.SLEEPING,
+    "eating": AgentState.EATING,
+}
+
+# 事件分类 -> 状态
+_CATEGORY_STATES = {"social": AgentState.SOCIALIZING, "work": AgentState.WORKING}
+
+# 事件ID -> 状态 的解析缓存（事件注册表版本变化时清空）
+_event_state_cache: Dict[str, Optional[AgentState]] = {}
+_event_state_version = -1
+
+
+def _state_for_event(event_id: str) -> Optional[AgentState]:
+    """解析事件对应的智能体状态；None 表示保持原状态"""
+    global _event_state_version
+    if _event_state_version != event_registry.version:
+        _event_state_cache.clear()
+        _event_state_version = event_registry.version
+
+    try:
+        return _event_state_cache[event_id]
+    except KeyError:
+        pass
+
+    state = _FIXED_EVENT_STATES.get(event_id)
+    if state is None:
+        # 基于事件分类回退
+        metadata = event_registry.get_event_metadata(event_id)
+        if metadata:
+            cat = getattr(metadata, "category", None)
+            state = _CATEGORY_STATES.get(str(getattr(cat, "value", cat)).lower())
+    _event_state_cache[event_id] = state
+    return state
+
+
+@lru_cache(maxsize=64)
+def _compute_preferences(
+    extraversion: float, conscientiousness: float, openness: float
+) -> Mapping[str, float]:
+    """按性格参数计算基础行为偏好权重（只读，按参数缓存）"""
+    preferences = {
+        "move": 0.3,
+        "talk": extraversion,
+        "work": conscientiousness,
+        "eat": 0.2,
+        "sleep": 0.1,
+        "socialize": extraversion * 0.8,
+        "reflect": openness,
+        "read": openness,
+        "create": openness,
+    }
+
+    # 内向者更喜欢独处活动
+    if extraversion < 0.5:
+        preferences["socialize"] *= 0.3
+        preferences["reflect"] *= 1.5
+        preferences["read"] = preferences.get("read", 0.5) * 1.3
+
+    return MappingProxyType(preferences)
+
+
+@lru_cache(maxsize=64)
+def _compute_durations(
+    agent_cls: type, behaviors: Tuple[str, ...], registry_version: int
+) -> Mapping[str, float]:
+    """
+    按行为列表计算基础持续时间（只读）
+
+    结果按 (智能体类, 行为列表, 事件注册表版本) 缓存，注册新事件后自动重新计算。
+    """
+    durations = {}
+    for behavior in behaviors:
+        b = (behavior or "").lower()
+        event_id = agent_cls._EVENT_ID_ALIASES.get(b, b)
+        metadata = event_registry.get_event_metadata(event_id)
+        if metadata and hasattr(metadata, "duration_range"):
+            min_dur, max_dur = metadata.duration_range
+            durations[behavior] = (min_dur + max_dur) / 2
+        else:
+            # 兜底值，尽量减少显式枚举
+            durations[behavior] = agent_cls._FALLBACK_DURATIONS.get(
+                event_id, agent_cls._DEFAULT_ACTION_MINUTES
+            )
+    return MappingProxyType(durations)
+
+
+def _agent_rng(agent_id: str) -> random.Random:
+    """
+    创建智能体的随机数生成器
+
+    设置环境变量 AI_TOWN_RANDOM_SEED 时，种子由 (该值, 智能体ID) 确定，可复现一次模拟；
+    未设置时使用系统随机种子。
+    """
+    seed = os.getenv("AI_TOWN_RANDOM_SEED")
+    return random.Random(f"{seed}:{agent_id}" if seed is not None else None)
 
 
 class BaseAgent(ABC):
@@ -66,6 +403,150 @@ class BaseAgent(ABC):
     - Reflection: 反思机制
     """
 
+    __slots__ = (
+        "agent_id",
+        "name",
+        "age",
+        "personality",
+        "background",
+        "_occupation",
+        "work_area",
+        "_state",
+        "_position",
+        "_energy",
+        "_mood",
+        "_store",
+        "_row",
+        "memory",
+        "planner",
+        "relationships",
+        "current_action",
+        "_action_start_time",
+        "_action_start_s",
+        "_perception_range_by_type",
+        "_perception_radius",
+        "_conversation_radius",
+        "available_behaviors",
+        "behavior_preferences",
+        "_action_durations",
+        "_action_duration_seconds",
+        "_reflection_task",
+        "_rng",
+    )
+
+    # 每个时间步的移动距离
+    MOVE_SPEED = 1.0
+
+    # 各类事件的感知距离倍数（conversation 以对话半径为基准，其余以感知半径为基准）
+    _PERCEPTION_MULTIPLIERS = {"conversation": 1.5, "movement": 1.0, "activity": 0.8}
+
+    # 行为持续时间（分钟）：事件元数据缺失时的兜底值
+    _FALLBACK_DURATIONS = {"movement": 2.0, "conversation": 5.0, "work": 30.0, "sleeping": 480.0}
+    _DEFAULT_ACTION_MINUTES = 10.0
+
+    # 行为偏好 / 持续时间（分钟）的固定调整：子类按需定义，在基础计算结果上覆盖
+    _BEHAVIOR_PREFERENCE_OVERRIDES: Mapping[str, float] = MappingProxyType({})
+    _ACTION_DURATION_OVERRIDES: Mapping[str, float] = MappingProxyType({})
+
+    # 反思洞察规则：(关键词, 最少命中记忆数, 洞察内容)，子类按需定义
+    _INSIGHT_RULES: Tuple[Tuple[Tuple[str, ...], int, str], ...] = ()
+    # 由 __init_subclass__ 构建：规则关键词组成的词表，及 (规则位掩码, 最少命中数, 洞察内容)
+    _INSIGHT_VOCABULARY: Tuple[str, ...] = ()
+    _compiled_insight_rules: Tuple[Tuple[int, int, str], ...] = ()
+
+    # 各状态在每个时间步带来的额外能量变化
+    _ENERGY_DELTA_BY_STATE = tuple(
+        {AgentState.SLEEPING: 5.0, AgentState.WORKING: -2.0}.get(state, 0.0) for state in AgentState
+    )
+
+    # 行为名 -> 事件ID 的别名（未列出的行为名视为已是事件ID）
+    _EVENT_ID_ALIASES = {
+        "move": "movement",
+        "talk": "conversation",
+        "sleep": "sleeping",
+        "eat": "eating",
+        "read": "reading",
+        "create": "creating",
+        "reflect": "reflection",
+        "explore": "town_exploration",
+        # 追加最小必要别名映射（来自角色常用行为）
+        "idle": "reflection",
+        "think": "reflection",
+        "plan": "reflection",
+        "relax": "socialize",
+        "rest": "sleeping",
+        "commute": "movement",
+        "take_break": "socialize",
+    }
+
+    # 事件ID -> 执行方法动词 的少量必要词形映射
+    _EXECUTOR_SPECIAL = {"movement": "move", "conversation": "talk", "town_exploration": "explore"}
+
+    # 名称符合 _execute_*_action 但并非动作执行方法的辅助方法
+    _NON_ACTION_EXECUTORS = frozenset({"current", "default", "generic"})
+
+    # 由 __init_subclass__ 按类构建：动作类型 -> 执行方法名；执行方法名 -> 协程执行函数
+    _EXECUTOR_TABLE: Dict[str, str] = {}
+    _EXECUTOR_FUNCS: Dict[str, Callable[..., Any]] = {}
+
+    # 由 __init_subclass__ 为每个类创建：动作类型 -> 已解析的执行信息（见 _get_action_handler）
+    _ACTION_HANDLERS: Dict[Optional[str], ActionDescriptor] = {}
+    _action_handlers_version = -1
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # 类创建时为洞察规则的关键词分配位，记忆写入时编码为位掩码，反思时只做按位与
+        bits = {}
+        for keywords, _, _ in cls._INSIGHT_RULES:
+            for word in keywords:
+                bits.setdefault(word.lower(), 1 << len(bits))
+        cls._INSIGHT_VOCABULARY = tuple(bits)
+        cls._compiled_insight_rules = tuple(
+            (sum(bits[word.lower()] for word in set(keywords)), min_count, insight)
+            for keywords, min_count, insight in cls._INSIGHT_RULES
+        )
+        cls._build_executor_table()
+        cls._ACTION_HANDLERS = {}
+        cls._action_handlers_version = -1
+
+    @classmethod
+    def _build_executor_table(cls):
+        """
+        构建动作类型到执行方法名的查找表
+
+        覆盖原逐次解析的全部规则，优先级从高到低：
+        精确匹配 _execute_{动作}_action > 少量特殊词形（movement->move 等）> *ing 词形还原。
+        """
+        methods = {}
+        for attr in dir(cls):
+            if attr.startswith("_execute_") and attr.endswith("_action"):
+                verb = attr[len("_execute_") : -len("_action")]
+                if verb and verb not in cls._NON_ACTION_EXECUTORS:
+                    methods[verb] = attr
+
+        table = {}
+        # *ing 词形：reading->read，creating->create（去掉 ing 的形式优先于补 e 的形式）
+        for verb, attr in methods.items():
+            if verb.endswith("e"):
+                table[verb[:-1] + "ing"] = attr
+        for verb, attr in methods.items():
+            table[verb + "ing"] = attr
+        for name, verb in cls._EXECUTOR_SPECIAL.items():
+            if verb in methods:
+                table[name] = methods[verb]
+        table.update(methods)
+
+        cls._EXECUTOR_TABLE = table
+
+        # 同步实现的执行方法在此包装为协程，执行时无需逐次判断
+        funcs = {}
+        for attr in methods.values():
+            func = getattr(cls, attr)
+            funcs[attr] = (
+                func if asyncio.iscoroutinefunction(func) else _as_coroutine_function(func)
+            )
+        cls._EXECUTOR_FUNCS = funcs
+
     def __init__(
         self,
         agent_id: str,
@@ -76,7 +557,6 @@ class BaseAgent(ABC):
         initial_position: Position,
         occupation: str = "resident",
         work_area: str = None,
-        **kwargs,
     ):
         self.agent_id = agent_id
         self.name = name
@@ -86,14 +566,16 @@ class BaseAgent(ABC):
         self.occupation = occupation
         self.work_area = work_area
 
-        # 状态管理
+        # 状态管理（由 AgentManager 托管时，状态 / 能量 / 心情存放在其数组中）
+        self._store = None
+        self._row = -1
         self.state = AgentState.IDLE
-        self.position = initial_position
+        self._position = initial_position
         self.energy = 100.0
         self.mood = 0.0  # -1.0 到 1.0
 
         # 核心组件
-        self.memory = MemoryStream(agent_id)
+        self.memory = MemoryStream(agent_id, self._INSIGHT_VOCABULARY)
         self.planner = ActionPlanner(self)
 
         # 社交关系
@@ -101,9 +583,17 @@ class BaseAgent(ABC):
 
         # 当前活动
         self.current_action: Optional[Dict[str, Any]] = None
-        self.action_start_time: Optional[datetime] = None
+        self._action_start_time: Optional[datetime] = None
+        self._action_start_s = float("nan")  # 开始时间的时间戳（秒），无开始时间时为 NaN
+
+        # 后台执行中的反思任务（反思不阻塞时间步）
+        self._reflection_task: Optional[asyncio.Task] = None
 
-        # 感知范围
+        # 每个智能体独立的随机数生成器：规划与后备决策不争用全局随机状态
+        self._rng = _agent_rng(agent_id)
+
+        # 感知范围（按事件类型的感知距离表在首次使用时计算，半径变化时失效）
+        self._perception_range_by_type: Optional[Dict[str, float]] = None
         self.perception_radius = 5.0
         self.conversation_radius = 2.0
 
@@ -115,6 +605,119 @@ class BaseAgent(ABC):
         # 创建初始记忆
         self._initialize_memories()
 
+    @property
+    def position(self) -> Position:
+        """当前位置（由 AgentManager 管理时为指向共享坐标存储的视图）"""
+        return self._position
+
+    @position.setter
+    def position(self, value: Position):
+        if isinstance(self._position, PositionView):
+            # 已绑定到共享存储时，写入存储而不是替换对象
+            self._position.x = value.x
+            self._position.y = value.y
+            self._position.area = value.area
+        else:
+            self._position = value
+
+    @property
+    def state(self) -> AgentState:
+        """当前状态"""
+        if self._store is None:
+            return self._state
+        return _STATES[self._store._state_codes[self._row]]
+
+    @state.setter
+    def state(self, value: AgentState):
+        if self._store is None:
+            self._state = value
+        else:
+            self._store._state_codes[self._row] = value
+
+    @property
+    def energy(self) -> float:
+        """能量（0-100）"""
+        if self._store is None:
+            return self._energy
+        return float(self._store._energy[self._row])
+
+    @energy.setter
+    def energy(self, value: float):
+        if self._store is None:
+            self._energy = value
+        else:
+            self._store._energy[self._row] = value
+
+    @property
+    def mood(self) -> float:
+        """心情（-1.0 到 1.0）"""
+        if self._store is None:
+            return self._mood
+        return float(self._store._mood[self._row])
+
+    @mood.setter
+    def mood(self, value: float):
+        if self._store is None:
+            self._mood = value
+        else:
+            self._store._mood[self._row] = value
+
+    @property
+    def occupation(self) -> str:
+        """职业"""
+        return self._occupation
+
+    @occupation.setter
+    def occupation(self, value: str):
+        position = getattr(self, "_position", None)
+        if isinstance(position, PositionView):
+            # 由管理器托管时同步其职业索引
+            position._store._on_occupation_change(self, self._occupation, value)
+        self._occupation = value
+
+    @property
+    def action_start_time(self) -> Optional[datetime]:
+        """当前行动的开始时间"""
+        return self._action_start_time
+
+    @action_start_time.setter
+    def action_start_time(self, value: Optional[datetime]):
+        self._action_start_time = value
+        self._action_start_s = value.timestamp() if value is not None else float("nan")
+
+    @property
+    def action_durations(self) -> Dict[str, float]:
+        """各行为的持续时间（分钟）"""
+        return self._action_durations
+
+    @action_durations.setter
+    def action_durations(self, value: Dict[str, float]):
+        self._action_durations = value
+        # 同步换算为秒，完成判断时直接与经过的秒数比较
+        self._action_duration_seconds = {
+            action: minutes * 60.0 for action, minutes in value.items()
+        }
+
+    @property
+    def perception_radius(self) -> float:
+        """感知半径"""
+        return self._perception_radius
+
+    @perception_radius.setter
+    def perception_radius(self, value: float):
+        self._perception_radius = value
+        self._perception_range_by_type = None
+
+    @property
+    def conversation_radius(self) -> float:
+        """对话半径"""
+        return self._conversation_radius
+
+    @conversation_radius.setter
+    def conversation_radius(self, value: float):
+        self._conversation_radius = value
+        self._perception_range_by_type = None
+
     def _define_available_behaviors(self) -> List[str]:
         """
         定义此智能体可用的行为类型（子类可重写）
@@ -133,24 +736,16 @@ class BaseAgent(ABC):
 
     def _define_behavior_preferences(self) -> Dict[str, float]:
         """基于性格定义行为偏好权重（子类可重写）"""
-        preferences = {
-            "move": 0.3,
-            "talk": self.personality.get("extraversion", 0.5),
-            "work": self.personality.get("conscientiousness", 0.7),
-            "eat": 0.2,
-            "sleep": 0.1,
-            "socialize": self.personality.get("extraversion", 0.5) * 0.8,
-            "reflect": self.personality.get("openness", 0.5),
-            "read": self.personality.get("openness", 0.5),
-            "create": self.personality.get("openness", 0.5),
-        }
-
-        # 内向者更喜欢独处活动
-        if self.personality.get("extraversion", 0.5) < 0.5:
-            preferences["socialize"] *= 0.3
-            preferences["reflect"] *= 1.5
-            preferences["read"] = preferences.get("read", 0.5) * 1.3
-
+        personality = self.personality
+        # 相同性格参数的智能体共用一次计算结果，复制后叠加类上的固定调整
+        preferences = dict(
+            _compute_preferences(
+                personality.get("extraversion", 0.5),
+                personality.get("conscientiousness", 0.7),
+                personality.get("openness", 0.5),
+            )
+        )
+        preferences.update(self._BEHAVIOR_PREFERENCE_OVERRIDES)
         return preferences
 
     def _define_action_durations(self) -> Dict[str, float]:
@@ -158,22 +753,16 @@ class BaseAgent(ABC):
         定义各种行为的持续时间（子类可重写）
         优先从统一事件元（EventRegistry）读取 duration_range，最少枚举。
         """
-        durations = {}
-        for behavior in self.available_behaviors:
-            event_id = self._to_event_id(behavior)
-            metadata = event_registry.get_event_metadata(event_id)
-            if metadata and hasattr(metadata, "duration_range"):
-                min_dur, max_dur = metadata.duration_range
-                durations[behavior] = (min_dur + max_dur) / 2
-            else:
-                # 兜底值，尽量减少显式枚举
-                defaults = {"movement": 2.0, "conversation": 5.0, "work": 30.0, "sleeping": 480.0}
-                durations[behavior] = defaults.get(event_id, 10.0)
+        # 同一类、同一组行为的智能体共用一次计算结果，复制后叠加类上的固定调整
+        durations = dict(
+            _compute_durations(type(self), tuple(self.available_behaviors), event_registry.version)
+        )
+        durations.update(self._ACTION_DURATION_OVERRIDES)
         return durations
 
     def _initialize_memories(self):
         """初始化基础记忆"""
-        initial_memory = Observation(
+        initial_memory = _obs_pool.acquire(
             timestamp=GameTime.now(),
             observer_id=self.agent_id,
             event_type="self_introduction",
@@ -182,6 +771,7 @@ class BaseAgent(ABC):
             importance=9.0,
         )
         self.memory.add_observation(initial_memory)
+        _obs_pool.release(initial_memory)
 
     def _to_event_id(self, behavior: str) -> str:
         """
@@ -190,105 +780,39 @@ class BaseAgent(ABC):
         未匹配则返回原值（假定已是事件ID）。
         """
         b = (behavior or "").lower()
-        mapping = {
-            "move": "movement",
-            "talk": "conversation",
-            "sleep": "sleeping",
-            "eat": "eating",
-            "read": "reading",
-            "create": "creating",
-            "reflect": "reflection",
-            "explore": "town_exploration",
-            # 追加最小必要别名映射（来自角色常用行为）
-            "idle": "reflection",
-            "think": "reflection",
-            "plan": "reflection",
-            "relax": "socialize",
-            "rest": "sleeping",
-            "commute": "movement",
-            "take_break": "socialize",
-        }
-        return mapping.get(b, b)
-
-    def _resolve_executor(self, action_type: str):
-        """
-        解析动作执行方法。优先精确匹配 _execute_{action_type}_action；
-        其次处理少量词形变化（movement->move, conversation->talk, *ing 还原）。
-        找不到则返回 None，由通用执行处理。
-        """
-        if not action_type:
-            return None
-        name = action_type.lower()
-        # 1) 直接匹配
-        method_name = f"_execute_{name}_action"
-        if hasattr(self, method_name):
-            return getattr(self, method_name)
-        # 2) 少量必要词形映射
-        special = {"movement": "move", "conversation": "talk", "town_exploration": "explore"}
-        if name in special:
-            m2 = f"_execute_{special[name]}_action"
-            if hasattr(self, m2):
-                return getattr(self, m2)
-        # 3) 处理 *ing 词形（read/create/sleep/eat/work 等）
-        if name.endswith("ing"):
-            base = name[:-3]  # reading->read, sleeping->sleep, eating->eat, working->work
-            for cand in (base, base + "e"):
-                m3 = f"_execute_{cand}_action"
-                if hasattr(self, m3):
-                    return getattr(self, m3)
-        return None
-
-    def _set_state_for_action(self, event_id: str):
-        """
-        根据事件ID或事件分类设置 AgentState，尽量不逐一枚举。
-        优先少量确定映射；否则依据事件分类（social->SOCIALIZING, work->WORKING）。
-        """
-        e = (event_id or "").lower()
-        fixed = {
-            "movement": AgentState.MOVING,
-            "conversation": AgentState.TALKING,
-            "socialize": AgentState.SOCIALIZING,
-            "work": AgentState.WORKING,
-            "sleeping": AgentState.SLEEPING,
-            "eating": AgentState.EATING,
-        }
-        if e in fixed:
-            self.state = fixed[e]
-            return
-        # 基于事件分类回退
-        metadata = event_registry.get_event_metadata(e)
-        if metadata:
-            cat = getattr(metadata, "category", None)
-            if str(getattr(cat, "value", cat)).lower() == "social":
-                self.state = AgentState.SOCIALIZING
-            elif str(getattr(cat, "value", cat)).lower() == "work":
-                self.state = AgentState.WORKING
-            # 其余分类保持原状态
+        return self._EVENT_ID_ALIASES.get(b, b)
 
-    async def step(self, world_state: Dict[str, Any]) -> Dict[str, Any]:
+    async def step(
+        self, world_state: Dict[str, Any], now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
         """
         执行一个时间步
 
         Args:
             world_state: 当前世界状态
+            now: 本步的游戏时间（默认取当前时间）；同一步内的观察共用该时间戳
 
         Returns:
             执行的动作信息
         """
+        if now is None:
+            now = GameTime.now()
+
         # 1. 感知环境
-        observations = await self._perceive(world_state)
+        observations = await self._perceive(world_state, now)
 
         # 2. 更新记忆
         for obs in observations:
             self.memory.add_observation(obs)
+            _obs_pool.release(obs)
 
-        # 3. 反思（如果需要）
+        # 3. 反思（如果需要）：在后台执行，洞察在完成后写入记忆，不阻塞本步
         if self.memory.should_reflect():
-            await self._reflect()
+            self._schedule_reflection(now)
 
         # 4. 规划行动
-        if self._should_replan():
-            await self._plan_next_action(world_state)
+        if self._should_replan(now):
+            await self._plan_next_action(world_state, now)
 
         # 5. 执行当前行动
         action_result = await self._execute_current_action(world_state)
@@ -298,65 +822,139 @@ class BaseAgent(ABC):
 
         return action_result
 
-    async def _perceive(self, world_state: Dict[str, Any]) -> List[Observation]:
+    async def _perceive(
+        self, world_state: Dict[str, Any], now: Optional[datetime] = None
+    ) -> List[Observation]:
         """感知环境，生成观察"""
         observations = []
-        current_time = GameTime.now()
+        current_time = now if now is not None else GameTime.now()
+
+        self_x, self_y = self.position.x, self.position.y
 
-        # 感知附近的其他智能体
+        # 感知附近的其他智能体（候选较多时使用向量化距离过滤）
         nearby_agents = world_state.get("nearby_agents", [])
-        for agent_data in nearby_agents:
+        if len(nearby_agents) >= VECTORIZE_THRESHOLD:
+            agents_xy = self._candidate_xy(world_state, "nearby_agents_xy", nearby_agents)
+            mask = within_radius_mask(self_x, self_y, agents_xy, self.perception_radius)
+            visible_agents = [nearby_agents[i] for i in np.flatnonzero(mask)]
+        else:
+            # 比较距离平方，避免逐个开方
+            radius_sq = self.perception_radius * self.perception_radius
+            visible_agents = [
+                agent_data
+                for agent_data in nearby_agents
+                if (agent_data["x"] - self_x) ** 2 + (agent_data["y"] - self_y) ** 2 <= radius_sq
+            ]
+
+        for agent_data in visible_agents:
             if agent_data["id"] != self.agent_id:
                 agent_pos = Position(
                     agent_data["x"], agent_data["y"], agent_data.get("area", "unknown")
                 )
-                if self.position.distance_to(agent_pos) <= self.perception_radius:
-                    obs = Observation(
-                        timestamp=current_time,
-                        observer_id=self.agent_id,
-                        event_type="agent_nearby",
-                        description=f"I see {agent_data['name']} at {agent_data['area']}",
-                        location=agent_pos,
-                        participants=[agent_data["id"]],
-                        importance=2.0,
-                    )
-                    observations.append(obs)
-
-        # 感知环境事件
-        events = world_state.get("events", [])
-        for event in events:
-            if self._can_perceive_event(event):
-                obs = Observation(
+                obs = _obs_pool.acquire(
                     timestamp=current_time,
                     observer_id=self.agent_id,
-                    event_type=event["type"],
-                    description=event["description"],
-                    location=Position(event["x"], event["y"], event.get("area", "unknown")),
-                    participants=event.get("participants", []),
-                    importance=event.get("importance", 3.0),
+                    event_type="agent_nearby",
+                    description=f"I see {agent_data['name']} at {agent_data['area']}",
+                    location=agent_pos,
+                    participants=[agent_data["id"]],
+                    importance=2.0,
                 )
                 observations.append(obs)
 
+        # 感知环境事件
+        events = world_state.get("events", [])
+        if len(events) >= VECTORIZE_THRESHOLD:
+            radii = np.fromiter(
+                (self._event_perception_range(event.get("type")) for event in events),
+                dtype=np.float64,
+                count=len(events),
+            )
+            events_xy = self._candidate_xy(world_state, "events_xy", events)
+            mask = within_radius_mask(self_x, self_y, events_xy, radii)
+            perceivable_events = [events[i] for i in np.flatnonzero(mask)]
+        else:
+            perceivable_events = [event for event in events if self._can_perceive_event(event)]
+
+        for event in perceivable_events:
+            obs = _obs_pool.acquire(
+                timestamp=current_time,
+                observer_id=self.agent_id,
+                event_type=event["type"],
+                description=event["description"],
+                location=Position(event["x"], event["y"], event.get("area", "unknown")),
+                participants=event.get("participants", []),
+                importance=event.get("importance", 3.0),
+            )
+            observations.append(obs)
+
         return observations
 
+    @staticmethod
+    def _candidate_xy(
+        world_state: Dict[str, Any], key: str, items: List[Dict[str, Any]]
+    ) -> np.ndarray:
+        """取世界状态中预先打包的坐标数组（与候选列表不匹配时现场打包）"""
+        xy = world_state.get(key)
+        if xy is None or len(xy) != len(items):
+            xy = positions_to_array(items)
+        return xy
+
+    def _event_perception_range(self, event_type: Optional[str]) -> float:
+        """获取某类事件的最大感知距离"""
+        ranges = self._perception_range_by_type
+        if ranges is None:
+            ranges = self._perception_range_by_type = self._build_perception_ranges()
+        return ranges.get(event_type, self._perception_radius)
+
+    def _build_perception_ranges(self) -> Dict[str, float]:
+        """按当前半径预先计算各类事件的感知距离"""
+        ranges = {
+            name: self._perception_radius * multiplier
+            for name, multiplier in self._PERCEPTION_MULTIPLIERS.items()
+        }
+        ranges["conversation"] = (
+            self._conversation_radius * self._PERCEPTION_MULTIPLIERS["conversation"]
+        )
+        return ranges
+
     def _can_perceive_event(self, event: Dict[str, Any]) -> bool:
         """判断是否能感知到某个事件"""
-        event_pos = Position(event["x"], event["y"])
-        distance = self.position.distance_to(event_pos)
-
         # 根据事件类型和距离判断
-        perception_range = {
-            "conversation": self.conversation_radius * 1.5,
-            "movement": self.perception_radius,
-            "activity": self.perception_radius * 0.8,
-            "default": self.perception_radius,
-        }
-
-        max_distance = perception_range.get(event.get("type"), perception_range["default"])
-        return distance <= max_distance
+        return within_range(
+            self.position.x,
+            self.position.y,
+            event["x"],
+            event["y"],
+            self._event_perception_range(event.get("type")),
+        )
 
-    async def _reflect(self):
+    def _schedule_reflection(self, now: datetime):
+        """发起一次后台反思；上一次反思尚未完成时不重复发起"""
+        task = self._reflection_task
+        if task is not None and not task.done():
+            return
+        self.memory.reset_importance_sum()
+        self._reflection_task = asyncio.create_task(self._reflect(now))
+        self._reflection_task.add_done_callback(self._on_reflection_done)
+
+    def _on_reflection_done(self, task: asyncio.Task):
+        """后台反思结束：记录异常，避免任务异常无人处理"""
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Error in agent {self.agent_id} reflection: {task.exception()}")
+
+    async def wait_for_reflection(self):
+        """等待进行中的后台反思完成（模拟停止时调用，避免洞察随任务一起丢失）"""
+        task = self._reflection_task
+        if task is not None and not task.done():
+            # asyncio.wait 不抛出任务自身的异常，异常已由 _on_reflection_done 记录
+            await asyncio.wait({task})
+
+    async def _reflect(self, now: Optional[datetime] = None):
         """执行反思，生成高级洞察"""
+        if now is None:
+            now = GameTime.now()
+
         # 获取最近的重要记忆
         recent_memories = self.memory.get_recent_memories(limit=50)
 
@@ -365,8 +963,8 @@ class BaseAgent(ABC):
 
         # 将洞察作为新的记忆添加
         for insight in insights:
-            reflection_obs = Observation(
-                timestamp=GameTime.now(),
+            reflection_obs = _obs_pool.acquire(
+                timestamp=now,
                 observer_id=self.agent_id,
                 event_type="reflection",
                 description=insight,
@@ -375,43 +973,79 @@ class BaseAgent(ABC):
                 metadata={"type": "reflection"},
             )
             self.memory.add_observation(reflection_obs)
+            _obs_pool.release(reflection_obs)
+
+    def _match_insight_rules(self, memories: List[Any]) -> List[str]:
+        """按类上预编译的洞察规则，从记忆中得出满足条件的洞察"""
+        rules = self._compiled_insight_rules
+        if len(memories) >= VECTORIZE_THRESHOLD and len(self._INSIGHT_VOCABULARY) < 64:
+            # 记忆较多时把位掩码打包成数组，每条规则的命中数是一次按位与加计数
+            masks = np.fromiter(
+                (memory.kw_mask for memory in memories), dtype=np.uint64, count=len(memories)
+            )
+            return [
+                insight
+                for rule_mask, min_count, insight in rules
+                if np.count_nonzero(masks & np.uint64(rule_mask)) >= min_count
+            ]
+
+        # 单次遍历：记忆写入时已编码关键词位掩码，按规则累计命中数，全部达标即提前结束
+        hits = [0] * len(rules)
+        pending = len(rules)
+        for memory in memories:
+            if not pending:
+                break
+            kw_mask = memory.kw_mask
+            for i, (rule_mask, min_count, _) in enumerate(rules):
+                if hits[i] < min_count and kw_mask & rule_mask:
+                    hits[i] += 1
+                    if hits[i] == min_count:
+                        pending -= 1
+        return [insight for (_, min_count, insight), n in zip(rules, hits) if n >= min_count]
 
     @abstractmethod
     async def _generate_insights(self, memories: List[Observation]) -> List[str]:
         """生成基于记忆的洞察（由子类实现）"""
         pass
 
-    def _should_replan(self) -> bool:
-        """判断是否需要重新规划"""
+    def _should_replan(self, now: Optional[datetime] = None) -> bool:
+        """判断是否需要重新规划（now 为本步时间，默认取当前时间）"""
         if self.current_action is None:
             return True
 
+        if now is None:
+            now = GameTime.now()
+
         # 检查当前行动是否完成
-        if self._is_current_action_complete():
+        if self._is_current_action_complete(now):
             return True
 
-        # 检查是否有重要的新信息需要调整计划
-        recent_important_memories = self.memory.get_memories_by_importance(
-            min_importance=7.0, hours_back=1
+        # 检查当前行动开始后是否有重要的新信息（一小时内）需要调整计划
+        last_important = self.memory.last_important_ts
+        return (
+            last_important is not None
+            and last_important > self.action_start_time
+            and (now - last_important).total_seconds() <= 3600
         )
 
-        return len(recent_important_memories) > 0
-
-    def _is_current_action_complete(self) -> bool:
+    def _is_current_action_complete(self, now: Optional[datetime] = None) -> bool:
         """检查当前行动是否完成"""
         if self.current_action is None or self.action_start_time is None:
             return True
 
-        # 基于行动类型和时间判断
-        elapsed_minutes = (GameTime.now() - self.action_start_time).total_seconds() / 60
+        # 基于行动类型和时间判断（直接比较时间戳秒数）
+        now_s = now.timestamp() if now is not None else GameTime.seconds_now()
+        return now_s - self._action_start_s >= self._expected_action_seconds()
 
+    def _expected_action_seconds(self) -> float:
+        """当前行动的预期持续时间（秒）"""
+        if self.current_action is None:
+            return 0.0
         action_type = self.current_action.get("type", "unknown")
-        expected_duration = self.action_durations.get(action_type, 10.0)
-
-        return elapsed_minutes >= expected_duration
+        return self._action_duration_seconds.get(action_type, self._DEFAULT_ACTION_MINUTES * 60.0)
 
-    async def _plan_next_action(self, world_state: Dict[str, Any]):
-        """规划下一个行动"""
+    async def _plan_next_action(self, world_state: Dict[str, Any], now: Optional[datetime] = None):
+        """规划下一个行动（行动开始时间默认取当前时间）"""
         # 获取相关记忆作为规划上下文
         context_memories = self.memory.retrieve_relevant(
             query=f"What should {self.name} do now?", limit=10
@@ -423,8 +1057,8 @@ class BaseAgent(ABC):
         )
 
         if self.current_action:
-            self.action_start_time = GameTime.now()
-            self.state = AgentState(self.current_action.get("state", "idle"))
+            self.action_start_time = now if now is not None else GameTime.now()
+            self.state = AgentState.from_label(self.current_action.get("state", "idle"))
 
     async def _execute_current_action(self, world_state: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -436,20 +1070,52 @@ class BaseAgent(ABC):
         action_type = self.current_action.get("type")
 
         # 行为可用性不再严格限制，缺省进入解析/通用执行
-        executor = self._resolve_executor(action_type)
-        if executor:
-            # 在具体执行前设置状态（具体方法内如有覆盖，以覆盖为准）
-            self._set_state_for_action(self._to_event_id(action_type))
-            return (
-                await executor(world_state)
-                if asyncio.iscoroutinefunction(executor)
-                else executor(world_state)
+        desc = self._get_action_handler(action_type)
+
+        # 在具体执行前设置状态（具体方法内如有覆盖，以覆盖为准）
+        if desc.target_state is not None:
+            self.state = desc.target_state
+        if desc.executor:
+            return await desc.executor(self, world_state)
+
+        # 通用执行：事件类型用标准化ID
+        return await self._execute_generic_action(desc.event_id, world_state)
+
+    def _get_action_handler(self, action_type: Optional[str]) -> ActionDescriptor:
+        """
+        获取动作的解析结果（协程执行函数、标准化事件ID、执行前设置的状态）。
+        解析结果按类缓存，同类智能体共用；事件注册表变化后重新解析。
+        """
+        cls = type(self)
+        handlers = cls._ACTION_HANDLERS
+        if cls._action_handlers_version != event_registry.version:
+            handlers.clear()
+            cls._action_handlers_version = event_registry.version
+
+        handler = handlers.get(action_type)
+        if handler is None:
+            method_name = self._EXECUTOR_TABLE.get(action_type.lower()) if action_type else None
+            event_id = self._to_event_id(action_type)
+            handler = ActionDescriptor(
+                self._EXECUTOR_FUNCS.get(method_name), event_id, _state_for_event(event_id)
             )
+            handlers[action_type] = handler
+        return handler
 
-        # 通用执行：事件类型用标准化ID，并设置状态
-        event_id = self._to_event_id(action_type)
-        self._set_state_for_action(event_id)
-        return await self._execute_generic_action(event_id, world_state)
+    async def _execute_generic_action(
+        self, event_id: str, world_state: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """通用执行：没有专门执行方法的动作，仅以标准化事件ID上报"""
+        return self._make_action_result(event_id)
+
+    def _make_action_result(self, type_: str, **extra) -> Dict[str, Any]:
+        """构建动作执行结果（类型、智能体ID、当前位置及附加字段）"""
+        return {
+            "type": type_,
+            "agent_id": self.agent_id,
+            "position": self.position.to_dict(),
+            **extra,
+        }
 
     async def _execute_default_action(
         self, attempted_action: str, world_state: Dict[str, Any]
@@ -457,14 +1123,15 @@ class BaseAgent(ABC):
         """
         默认回退：不枚举别名，直接走通用执行，事件类型使用标准化ID。
         """
-        event_id = self._to_event_id(attempted_action)
-        self._set_state_for_action(event_id)
-        return await self._execute_generic_action(event_id, world_state)
+        desc = self._get_action_handler(attempted_action)
+        if desc.target_state is not None:
+            self.state = desc.target_state
+        return await self._execute_generic_action(desc.event_id, world_state)
 
     def receive_message(self, sender_id: str, message: str, context: Dict[str, Any]):
         """接收来自其他智能体的消息"""
         # 创建观察记录
-        obs = Observation(
+        obs = _obs_pool.acquire(
             timestamp=GameTime.now(),
             observer_id=self.agent_id,
             event_type="received_message",
@@ -475,6 +1142,7 @@ class BaseAgent(ABC):
             metadata={"message": message, "sender": sender_id},
         )
         self.memory.add_observation(obs)
+        _obs_pool.release(obs)
 
     def get_status(self) -> Dict[str, Any]:
         """获取智能体当前状态"""
@@ -484,8 +1152,8 @@ class BaseAgent(ABC):
             "age": self.age,
             "occupation": self.occupation,
             "work_area": self.work_area,
-            "position": {"x": self.position.x, "y": self.position.y, "area": self.position.area},
-            "state": self.state.value,
+            "position": self.position.to_dict(),
+            "state": self.state.label,
             "energy": self.energy,
             "mood": self.mood,
             "current_action": self.current_action,
@@ -500,26 +1168,23 @@ class BaseAgent(ABC):
         target = self.current_action.get("target_position")
         if target:
             # 简单的移动逻辑
-            dx = target["x"] - self.position.x
-            dy = target["y"] - self.position.y
-            distance = (dx**2 + dy**2) ** 0.5
+            x, y = self.position.x, self.position.y
+            dx = target["x"] - x
+            dy = target["y"] - y
+            dist_sq = dx * dx + dy * dy
 
-            if distance > 0.1:  # 还未到达
+            if dist_sq > 0.1 * 0.1:  # 还未到达（比较距离平方，避免开方）
                 # 每步移动一定距离
-                move_speed = 1.0
-                if distance > move_speed:
-                    self.position.x += (dx / distance) * move_speed
-                    self.position.y += (dy / distance) * move_speed
+                move_speed = self.MOVE_SPEED
+                if dist_sq > move_speed * move_speed:
+                    scale = move_speed / sqrt(dist_sq)
+                    self.position.shift(dx * scale, dy * scale)
                 else:
                     self.position.x = target["x"]
                     self.position.y = target["y"]
                     self.position.area = target.get("area", self.position.area)
 
-        return {
-            "type": "movement",
-            "agent_id": self.agent_id,
-            "position": {"x": self.position.x, "y": self.position.y, "area": self.position.area},
-        }
+        return self._make_action_result("movement")
 
     async def _execute_talk_action(self, world_state: Dict[str, Any]) -> Dict[str, Any]:
         """执行对话行动"""
@@ -527,13 +1192,7 @@ class BaseAgent(ABC):
         target_id = self.current_action.get("target_agent")
         message = self.current_action.get("message", f"Hello!")
 
-        return {
-            "type": "conversation",
-            "agent_id": self.agent_id,
-            "target_agent": target_id,
-            "message": message,
-            "position": {"x": self.position.x, "y": self.position.y, "area": self.position.area},
-        }
+        return self._make_action_result("conversation", target_agent=target_id, message=message)
 
     async def _execute_work_action(self, world_state: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -542,96 +1201,51 @@ class BaseAgent(ABC):
         self.state = AgentState.WORKING
         work_type = self.current_action.get("work_type", "general")
 
-        return {
-            "type": "work",
-            "agent_id": self.agent_id,
-            "work_type": work_type,
-            "position": {"x": self.position.x, "y": self.position.y, "area": self.position.area},
-        }
+        return self._make_action_result("work", work_type=work_type)
 
     async def _execute_socialize_action(self, world_state: Dict[str, Any]) -> Dict[str, Any]:
         """执行社交行动"""
         self.state = AgentState.SOCIALIZING
         activity = self.current_action.get("activity", "chat")
 
-        return {
-            "type": "socialize",
-            "agent_id": self.agent_id,
-            "activity": activity,
-            "position": {"x": self.position.x, "y": self.position.y, "area": self.position.area},
-        }
+        return self._make_action_result("socialize", activity=activity)
 
     async def _execute_reflect_action(self, world_state: Dict[str, Any]) -> Dict[str, Any]:
         """执行反思行动"""
         reflection_topic = self.current_action.get("topic", "recent_experiences")
 
-        return {
-            "type": "reflection",
-            "agent_id": self.agent_id,
-            "topic": reflection_topic,
-            "position": {"x": self.position.x, "y": self.position.y, "area": self.position.area},
-        }
+        return self._make_action_result("reflection", topic=reflection_topic)
 
     async def _execute_read_action(self, world_state: Dict[str, Any]) -> Dict[str, Any]:
         """执行阅读行动"""
         material = self.current_action.get("material", "book")
 
-        return {
-            "type": "reading",
-            "agent_id": self.agent_id,
-            "material": material,
-            "position": {"x": self.position.x, "y": self.position.y, "area": self.position.area},
-        }
+        return self._make_action_result("reading", material=material)
 
     async def _execute_create_action(self, world_state: Dict[str, Any]) -> Dict[str, Any]:
         """执行创作行动"""
         creation_type = self.current_action.get("creation_type", "writing")
 
-        return {
-            "type": "creating",
-            "agent_id": self.agent_id,
-            "creation_type": creation_type,
-            "position": {"x": self.position.x, "y": self.position.y, "area": self.position.area},
-        }
+        return self._make_action_result("creating", creation_type=creation_type)
 
     async def _execute_eat_action(self, world_state: Dict[str, Any]) -> Dict[str, Any]:
         """
         执行进食行动，统一事件类型为 'eating'
         """
         self.state = AgentState.EATING
-        return {
-            "type": "eating",
-            "agent_id": self.agent_id,
-            "position": {"x": self.position.x, "y": self.position.y, "area": self.position.area},
-        }
+        return self._make_action_result("eating")
 
     async def _execute_sleep_action(self, world_state: Dict[str, Any]) -> Dict[str, Any]:
         """
         执行睡眠行动，统一事件类型为 'sleeping'
         """
         self.state = AgentState.SLEEPING
-        return {
-            "type": "sleeping",
-            "agent_id": self.agent_id,
-            "position": {"x": self.position.x, "y": self.position.y, "area": self.position.area},
-        }
+        return self._make_action_result("sleeping")
 
     def _update_internal_state(self):
         """更新内部状态"""
-        # 更新能量
-        self.energy -= 1.0  # 基础消耗
-        if self.state == AgentState.SLEEPING:
-            self.energy += 5.0
-        elif self.state == AgentState.WORKING:
-            self.energy -= 2.0
-
-        # 限制范围
-        self.energy = max(0, min(100, self.energy))
-
-        # 更新心情（简单实现）
-        if self.energy < 20:
-            self.mood -= 0.1
-        elif self.energy > 80:
-            self.mood += 0.05
-
-        self.mood = max(-1.0, min(1.0, self.mood))
+        self.energy, self.mood = update_energy_mood(
+            float(self.energy),
+            float(self.mood),
+            self._ENERGY_DELTA_BY_STATE[self.state],
+        )
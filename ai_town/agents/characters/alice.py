@@ -4,13 +4,180 @@ Alice - LLM 增强的智能体角色
 """
 
 import asyncio
-import random
-from typing import Any, Dict, List
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Set, Tuple
 
 from ai_town.agents.base_agent import Position
 from ai_town.agents.llm_enhanced_agent import LLMEnhancedAgent
+from ai_town.config_loader import get_llm_config_for_agent
 from ai_town.core.time_manager import GameTime
 
+# 性格与背景对所有 Alice 实例相同，构建一次后共享；性格字典在实例上复制一份，允许单独调整
+_PERSONALITY = MappingProxyType(
+    {
+        "extraversion": 0.8,  # 外向性
+        "agreeableness": 0.9,  # 宜人性
+        "conscientiousness": 0.7,  # 尽责性
+        "neuroticism": 0.2,  # 神经质
+        "openness": 0.6,  # 开放性
+    }
+)
+
+_BACKGROUND = (
+    "Alice 是一位温暖友好的咖啡店老板，今年32岁。"
+    "她5年前搬到这个小镇，开了她梦想中的咖啡店。"
+    "Alice 喜欢结识新朋友，让每个人都感到宾至如归。"
+    "她以出色的咖啡和记住每个人最爱的订单而闻名。"
+    "闲暇时，她喜欢读书和尝试新的咖啡配方。"
+)
+
+# 日常作息、工作任务与对话开场白都是固定内容，模块级只读常量避免每次调用重建
+_DAILY_SCHEDULE = (
+    MappingProxyType({"time": "06:00", "activity": "wake_up", "location": "home"}),
+    MappingProxyType({"time": "06:30", "activity": "prepare_for_work", "location": "home"}),
+    MappingProxyType({"time": "07:00", "activity": "commute_to_shop", "location": "street"}),
+    MappingProxyType({"time": "07:30", "activity": "open_shop", "location": "coffee_shop"}),
+    MappingProxyType({"time": "08:00", "activity": "serve_customers", "location": "coffee_shop"}),
+    MappingProxyType({"time": "12:00", "activity": "lunch_break", "location": "coffee_shop"}),
+    MappingProxyType({"time": "13:00", "activity": "serve_customers", "location": "coffee_shop"}),
+    MappingProxyType({"time": "17:00", "activity": "close_shop", "location": "coffee_shop"}),
+    MappingProxyType({"time": "17:30", "activity": "social_time", "location": "park"}),
+    MappingProxyType({"time": "19:00", "activity": "dinner", "location": "home"}),
+    MappingProxyType({"time": "20:00", "activity": "read_book", "location": "home"}),
+    MappingProxyType({"time": "22:00", "activity": "sleep", "location": "home"}),
+)
+
+_WORK_TASKS = (
+    "Clean coffee machines",
+    "Prepare fresh coffee beans",
+    "Serve customers with a smile",
+    "Maintain clean and welcoming atmosphere",
+    "Try new coffee recipes",
+    "Chat with regular customers",
+    "Manage inventory",
+    "Balance daily cash register",
+)
+
+# 后备决策的候选行为（返回前复制，调用方可自由修改）
+_WORK_ACTIONS = (
+    MappingProxyType({"type": "work", "description": "制作新鲜咖啡"}),
+    MappingProxyType({"type": "work", "description": "清理咖啡机"}),
+    MappingProxyType({"type": "work", "description": "招呼顾客"}),
+    MappingProxyType({"type": "work", "description": "尝试新的咖啡配方"}),
+    MappingProxyType({"type": "socialize", "description": "与常客聊天"}),
+)
+_EVENING_ACTIVITIES = (
+    MappingProxyType({"type": "socialize", "description": "与朋友聊天"}),
+    MappingProxyType({"type": "explore", "description": "探索小镇新角落"}),
+    MappingProxyType({"type": "relax", "description": "享受悠闲时光"}),
+    MappingProxyType({"type": "plan", "description": "计划明天的咖啡店活动"}),
+)
+_NIGHT_ACTIVITIES = (
+    MappingProxyType({"type": "relax", "description": "阅读咖啡制作相关的书籍"}),
+    MappingProxyType({"type": "plan", "description": "为明天准备新的咖啡配方"}),
+    MappingProxyType({"type": "rest", "description": "准备就寝"}),
+    MappingProxyType({"type": "think", "description": "回想今天与顾客的有趣对话"}),
+)
+
+
+def _move_action(x: float, y: float, area: str, reason: str) -> Mapping[str, Any]:
+    """构造只读的移动行为"""
+    return MappingProxyType(
+        {
+            "type": "move",
+            "position": MappingProxyType({"x": x, "y": y, "area": area}),
+            "reason": reason,
+        }
+    )
+
+
+_GO_TO_SHOP = (_move_action(25, 25, "coffee_shop", "去咖啡店工作"),)
+_GO_HOME = (_move_action(10, 75, "house_1", "回家休息"),)
+_EVENING_OUTINGS = (
+    _move_action(50, 50, "park", "去公园散步"),
+    _move_action(35, 20, "bookstore", "去书店看看有什么新书"),
+    _move_action(70, 40, "restaurant", "去餐厅吃晚饭"),
+    _move_action(60, 55, "market", "去市场买新鲜食材"),
+)
+# 傍晚在咖啡店：40% 外出（每个目的地 2/20），60% 继续活动（每项 3/20），一次等概率抽取即可
+_EVENING_AT_SHOP = _EVENING_OUTINGS * 2 + _EVENING_ACTIVITIES * 3
+
+# 决策表：时间段 -> (常驻区域, 在该区域时的候选行为, 不在该区域时的候选行为)
+_WORK_HOURS = ("coffee_shop", _WORK_ACTIONS, _GO_TO_SHOP)
+_DECISION_TABLE = MappingProxyType(
+    {
+        "morning": _WORK_HOURS,
+        "afternoon": _WORK_HOURS,
+        "evening": ("coffee_shop", _EVENING_AT_SHOP, _EVENING_ACTIVITIES),
+        "night": ("house_1", _NIGHT_ACTIVITIES, _GO_HOME),
+    }
+)
+
+
+def _fresh_action(action: Mapping[str, Any]) -> Dict[str, Any]:
+    """复制候选行为（含嵌套的位置），调用方可自由修改"""
+    fresh = dict(action)
+    position = fresh.get("position")
+    if position is not None:
+        fresh["position"] = dict(position)
+    return fresh
+
+
+# 后备对话开场白（{name} 替换为对方名字）
+_GREETINGS = (
+    "你好，{name}！欢迎来我的咖啡店！",
+    "嗨 {name}！今天想喝点什么吗？",
+    "{name}，很高兴见到你！我刚泡了新鲜的咖啡。",
+    "欢迎，{name}！坐下来聊聊天吧！",
+)
+# 顾客互动类型 -> 回应
+_CUSTOMER_RESPONSES = MappingProxyType(
+    {
+        "order_coffee": "Of course! What can I get started for you today?",
+        "casual_chat": "I'm doing well, thanks for asking! How about you?",
+        "compliment_coffee": "Thank you so much! I really put a lot of care into each cup.",
+        "ask_recommendation": "I'd recommend trying our house blend - it's got a lovely smooth finish!",
+    }
+)
+
+# 愿意被主动搭话的状态（标签与整数编码两种形式）及主动搭话的距离
+_APPROACHABLE_STATES = frozenset({"idle", "socializing"})
+_APPROACH_DISTANCE = 3.0
+
+_TENDS_TO_ASK_ABOUT = ("how_are_you", "coffee_preferences", "daily_activities")
+_CONVERSATION_STARTERS = (
+    "How's your day going so far?",
+    "Have you tried our new coffee blend?",
+    "Beautiful weather today, isn't it?",
+    "What brings you by the shop today?",
+    "How do you like your coffee prepared?",
+)
+_FAVORITE_TOPICS = ("coffee", "books", "travel", "food", "community")
+_CONVERSATION_STYLE = MappingProxyType(
+    {
+        "tone": "warm and friendly",
+        "topics": _FAVORITE_TOPICS,
+        "greeting_style": "enthusiastic",
+        "tends_to_ask_about": _TENDS_TO_ASK_ABOUT,
+        "conversation_starters": _CONVERSATION_STARTERS,
+    }
+)
+
+_AVAILABLE_BEHAVIORS = (
+    "move",
+    "talk",
+    "work",  # 基础行为
+    "socialize",
+    "greet_customer",
+    "make_coffee",  # 咖啡店相关
+    "chat_with_regulars",
+    "recommend_drink",
+    "clean_shop",  # 服务相关
+    "eat",
+    "sleep",
+    "take_break",  # 生理需求
+)
+
 
 class Alice(LLMEnhancedAgent):
     """
@@ -23,34 +190,136 @@ class Alice(LLMEnhancedAgent):
     - 工作勤奋
     """
 
-    def __init__(self):
-        personality = {
-            "extraversion": 0.8,  # 外向性
-            "agreeableness": 0.9,  # 宜人性
-            "conscientiousness": 0.7,  # 尽责性
-            "neuroticism": 0.2,  # 神经质
-            "openness": 0.6,  # 开放性
+    __slots__ = ("regular_customers",)
+
+    # Alice 作为外向的咖啡店老板的特殊偏好
+    _BEHAVIOR_PREFERENCE_OVERRIDES = MappingProxyType(
+        {
+            "socialize": 0.9,  # 非常喜欢社交
+            "greet_customer": 0.8,  # 喜欢迎接顾客
+            "make_coffee": 0.7,  # 喜欢制作咖啡
+            "chat_with_regulars": 0.9,  # 喜欢与常客聊天
+            "recommend_drink": 0.8,  # 喜欢推荐饮品
+            "clean_shop": 0.6,  # 保持店铺整洁
+            "reflect": 0.4,  # 不太喜欢独自思考
+            "work": 0.7,  # 工作认真
         }
+    )
+
+    # Alice 的专门行为时间
+    _ACTION_DURATION_OVERRIDES = MappingProxyType(
+        {
+            "greet_customer": 3.0,  # 快速热情问候
+            "make_coffee": 8.0,  # 制作咖啡
+            "chat_with_regulars": 12.0,  # 与常客聊天
+            "recommend_drink": 5.0,  # 推荐饮品
+            "clean_shop": 15.0,  # 清洁店铺
+            "take_break": 10.0,  # 短暂休息
+        }
+    )
+
+    # 洞察规则：客户模式、社交互动、工作相关
+    _INSIGHT_RULES = (
+        (
+            ("customer", "coffee"),
+            3,
+            "I've been noticing more customers are interested in specialty coffee. "
+            "Maybe I should consider expanding my menu with more unique blends.",
+        ),
+        (
+            ("talk", "conversation", "chat"),
+            5,
+            "I really enjoy connecting with people in my community. "
+            "These conversations make running the coffee shop so rewarding.",
+        ),
+        (
+            ("work", "coffee_shop"),
+            4,
+            "The coffee shop is becoming a real community hub. "
+            "I should think about hosting some events to bring people together.",
+        ),
+    )
+
+    # 回退对话规则：按顺序匹配关键词，命中第一条即从其候选回应中随机选取
+    _FALLBACK_RESPONSE_RULES = (
+        # 咖啡相关话题
+        (
+            ("咖啡", "coffee", "drink", "latte", "espresso", "brew"),
+            (
+                "哦，你也是咖啡爱好者！我很乐意为你推荐一些特别的饮品。",
+                "咖啡对我来说不只是饮品，更像是艺术品。每一杯都有自己的故事。",
+                "你有什么特别喜欢的咖啡口味吗？我一直在尝试新的配方。",
+                "一杯好咖啡真的能让整天都变得美好，不是吗？",
+                "我们有最好的咖啡豆！你想试试今天的特调吗？",
+                "刚烘焙的豆子特别香，你一定会喜欢的。",
+            ),
+        ),
+        # 工作相关话题
+        (
+            ("店", "work", "job", "busy", "shop", "business"),
+            (
+                "经营咖啡店虽然忙碌，但看到顾客因为我的咖啡而微笑，一切都值得了。",
+                "这个小镇的人们真的很棒，每天都有新的故事和有趣的对话。",
+                "我喜欢我的工作，因为它让我能够为社区带来一些温暖。",
+                "忙碌的日子让时间过得特别快，但我享受每一刻。",
+                "这家店是我的心血，我希望每个人都能感到舒适。",
+                "我努力让这里成为大家聚会聊天的好地方。",
+            ),
+        ),
+        # 朋友和社交
+        (
+            ("朋友", "friend"),
+            (
+                "我很享受和不同的人聊天，每个人都有有趣的故事。",
+                "这里的常客都是我的好朋友！",
+                "我希望能认识更多像你这样的朋友。",
+            ),
+        ),
+        # 天气相关
+        (
+            ("weather", "sunny", "rain", "cold", "warm"),
+            (
+                "是啊，这样的天气很适合坐在店里慢慢品味一杯热咖啡呢。",
+                "不管天气如何，总有一款咖啡适合当下的心情。",
+                "我喜欢观察不同天气下，人们对咖啡的选择也会不同。",
+                "天气变化时，咖啡就成了最好的陪伴。",
+            ),
+        ),
+        # 问候和关心
+        (
+            ("how", "doing", "good", "great", "fine"),
+            (
+                "谢谢你的关心，{speaker_name}！我过得很不错，店里的生意也很好。",
+                "每天都充满新的可能性，我很享受这种感觉！你呢？",
+                "生活很美好，特别是能在这里遇见像你这样的好朋友。",
+                "我一直都很好，因为做着自己喜欢的事情。最近你怎么样？",
+            ),
+        ),
+    )
+    _FALLBACK_RESPONSES = (
+        "这很有趣，{speaker_name}！请告诉我更多。",
+        "我很喜欢听你分享这些，继续说吧！",
+        "你总是有这么有趣的想法，我很欣赏。",
+        "这让我想起了一些相似的经历...",
+        "谢谢你和我分享这个，真的很棒！",
+        "真的吗？告诉我更多！",
+        "让我们继续聊下去！",
+    )
+
+    # Alice 特定的固定属性（类级常量；__slots__ 下实例不能改写）
+    favorite_topics: Tuple[str, ...] = _FAVORITE_TOPICS
+    coffee_knowledge = 8.5  # 1-10 scale
 
-        background = (
-            "Alice 是一位温暖友好的咖啡店老板，今年32岁。"
-            "她5年前搬到这个小镇，开了她梦想中的咖啡店。"
-            "Alice 喜欢结识新朋友，让每个人都感到宾至如归。"
-            "她以出色的咖啡和记住每个人最爱的订单而闻名。"
-            "闲暇时，她喜欢读书和尝试新的咖啡配方。"
-        )
-
+    def __init__(self):
         # 从配置文件获取 LLM 设置
-        from ai_town.config_loader import get_llm_config_for_agent
-
         llm_config = get_llm_config_for_agent("alice")
 
         super().__init__(
             agent_id="alice",
             name="Alice",
             age=32,
-            personality=personality,
-            background=background,
+            personality=dict(_PERSONALITY),
+            background=_BACKGROUND,
             initial_position=Position(25, 25, "coffee_shop"),
             occupation="coffee_shop_owner",
             work_area="coffee_shop",
@@ -63,160 +332,42 @@ class Alice(LLMEnhancedAgent):
         self.use_llm_for_reflection = llm_config["use_llm_for_reflection"]
 
         # Alice 特定的属性
-        self.favorite_topics = ["coffee", "books", "travel", "food", "community"]
-        self.regular_customers = []
-        self.coffee_knowledge = 8.5  # 1-10 scale
-
-    def _define_available_behaviors(self) -> List[str]:
-        """Alice 可用的行为类型"""
-        return [
-            "move",
-            "talk",
-            "work",  # 基础行为
-            "socialize",
-            "greet_customer",
-            "make_coffee",  # 咖啡店相关
-            "chat_with_regulars",
-            "recommend_drink",
-            "clean_shop",  # 服务相关
-            "eat",
-            "sleep",
-            "take_break",  # 生理需求
-        ]
-
-    def _define_behavior_preferences(self) -> Dict[str, float]:
-        """Alice 的行为偏好"""
-        preferences = super()._define_behavior_preferences()
-
-        # Alice 作为外向的咖啡店老板的特殊偏好
-        preferences.update(
-            {
-                "socialize": 0.9,  # 非常喜欢社交
-                "greet_customer": 0.8,  # 喜欢迎接顾客
-                "make_coffee": 0.7,  # 喜欢制作咖啡
-                "chat_with_regulars": 0.9,  # 喜欢与常客聊天
-                "recommend_drink": 0.8,  # 喜欢推荐饮品
-                "clean_shop": 0.6,  # 保持店铺整洁
-                "reflect": 0.4,  # 不太喜欢独自思考
-                "work": 0.7,  # 工作认真
-            }
-        )
-
-        return preferences
-
-    def _define_action_durations(self) -> Dict[str, float]:
-        """Alice 的行为持续时间"""
-        durations = super()._define_action_durations()
-
-        # Alice 的专门行为时间
-        durations.update(
-            {
-                "greet_customer": 3.0,  # 快速热情问候
-                "make_coffee": 8.0,  # 制作咖啡
-                "chat_with_regulars": 12.0,  # 与常客聊天
-                "recommend_drink": 5.0,  # 推荐饮品
-                "clean_shop": 15.0,  # 清洁店铺
-                "take_break": 10.0,  # 短暂休息
-            }
-        )
+        self.regular_customers: Set[str] = set()
 
-        return durations
+    def _define_available_behaviors(self) -> Tuple[str, ...]:
+        """Alice 可用的行为类型（模块级只读常量，所有实例共享）"""
+        return _AVAILABLE_BEHAVIORS
 
     async def _execute_greet_customer_action(self, world_state: Dict[str, Any]) -> Dict[str, Any]:
         """执行迎接顾客行动"""
-        return {
-            "type": "customer_greeting",
-            "agent_id": self.agent_id,
-            "activity": "welcoming_customers",
-            "position": {"x": self.position.x, "y": self.position.y, "area": self.position.area},
-        }
+        return self._make_action_result("customer_greeting", activity="welcoming_customers")
 
     async def _execute_make_coffee_action(self, world_state: Dict[str, Any]) -> Dict[str, Any]:
         """执行制作咖啡行动"""
         coffee_type = self.current_action.get("coffee_type", "espresso")
-        return {
-            "type": "coffee_making",
-            "agent_id": self.agent_id,
-            "coffee_type": coffee_type,
-            "position": {"x": self.position.x, "y": self.position.y, "area": self.position.area},
-        }
+        return self._make_action_result("coffee_making", coffee_type=coffee_type)
 
     async def _execute_chat_with_regulars_action(
         self, world_state: Dict[str, Any]
     ) -> Dict[str, Any]:
         """执行与常客聊天行动"""
-        return {
-            "type": "friendly_chat",
-            "agent_id": self.agent_id,
-            "activity": "chatting_with_regular_customers",
-            "position": {"x": self.position.x, "y": self.position.y, "area": self.position.area},
-        }
+        return self._make_action_result("friendly_chat", activity="chatting_with_regular_customers")
 
     async def _execute_recommend_drink_action(self, world_state: Dict[str, Any]) -> Dict[str, Any]:
         """执行推荐饮品行动"""
-        return {
-            "type": "drink_recommendation",
-            "agent_id": self.agent_id,
-            "activity": "suggesting_beverages",
-            "position": {"x": self.position.x, "y": self.position.y, "area": self.position.area},
-        }
+        return self._make_action_result("drink_recommendation", activity="suggesting_beverages")
 
     async def _execute_clean_shop_action(self, world_state: Dict[str, Any]) -> Dict[str, Any]:
         """执行清洁店铺行动"""
-        return {
-            "type": "shop_maintenance",
-            "agent_id": self.agent_id,
-            "activity": "cleaning_coffee_shop",
-            "position": {"x": self.position.x, "y": self.position.y, "area": self.position.area},
-        }
+        return self._make_action_result("shop_maintenance", activity="cleaning_coffee_shop")
 
     async def _generate_insights(self, memories: List) -> List[str]:
         """生成 Alice 特有的洞察"""
-        insights = []
-
-        # 分析客户模式
-        customer_memories = [
-            m
-            for m in memories
-            if "customer" in m.description.lower() or "coffee" in m.description.lower()
-        ]
-
-        if len(customer_memories) >= 3:
-            insights.append(
-                "I've been noticing more customers are interested in specialty coffee. "
-                "Maybe I should consider expanding my menu with more unique blends."
-            )
-
-        # 分析社交互动
-        social_memories = [
-            m
-            for m in memories
-            if any(keyword in m.description.lower() for keyword in ["talk", "conversation", "chat"])
-        ]
-
-        if len(social_memories) >= 5:
-            insights.append(
-                "I really enjoy connecting with people in my community. "
-                "These conversations make running the coffee shop so rewarding."
-            )
-
-        # 分析工作相关记忆
-        work_memories = [
-            m
-            for m in memories
-            if "work" in m.description.lower() or "coffee_shop" in m.description.lower()
-        ]
-
-        if len(work_memories) >= 4:
-            insights.append(
-                "The coffee shop is becoming a real community hub. "
-                "I should think about hosting some events to bring people together."
-            )
-
-        # 时间相关洞察
-        morning_memories = [m for m in memories if GameTime.get_time_of_day() == "morning"]
+        # 客户模式、社交互动、工作相关
+        insights = self._match_insight_rules(memories)
 
-        if len(morning_memories) >= 3:
+        # 时间相关洞察：时段与单条记忆无关，只需判断一次
+        if len(memories) >= 3 and GameTime.get_time_of_day() == "morning":
             insights.append(
                 "Mornings are always busy at the shop. "
                 "People really depend on their coffee to start the day right."
@@ -224,38 +375,18 @@ class Alice(LLMEnhancedAgent):
 
         return insights[:3]  # 最多返回3个洞察
 
-    def get_conversation_style(self) -> Dict[str, Any]:
-        """获取 Alice 的对话风格"""
-        return {
-            "tone": "warm and friendly",
-            "topics": self.favorite_topics,
-            "greeting_style": "enthusiastic",
-            "tends_to_ask_about": ["how_are_you", "coffee_preferences", "daily_activities"],
-            "conversation_starters": [
-                "How's your day going so far?",
-                "Have you tried our new coffee blend?",
-                "Beautiful weather today, isn't it?",
-                "What brings you by the shop today?",
-                "How do you like your coffee prepared?",
-            ],
-        }
+    def get_conversation_style(self) -> Mapping[str, Any]:
+        """获取 Alice 的对话风格（只读的模块级常量）"""
+        return _CONVERSATION_STYLE
 
     async def handle_customer_interaction(
         self, customer_id: str, interaction_type: str
     ) -> Dict[str, Any]:
         """处理客户互动"""
-        if customer_id not in self.regular_customers:
-            self.regular_customers.append(customer_id)
+        self.regular_customers.add(customer_id)
 
         # 根据互动类型生成响应
-        responses = {
-            "order_coffee": "Of course! What can I get started for you today?",
-            "casual_chat": "I'm doing well, thanks for asking! How about you?",
-            "compliment_coffee": "Thank you so much! I really put a lot of care into each cup.",
-            "ask_recommendation": "I'd recommend trying our house blend - it's got a lovely smooth finish!",
-        }
-
-        response = responses.get(interaction_type, "Thanks for stopping by!")
+        response = _CUSTOMER_RESPONSES.get(interaction_type, "Thanks for stopping by!")
 
         return {
             "type": "customer_service",
@@ -264,202 +395,37 @@ class Alice(LLMEnhancedAgent):
             "mood_impact": 0.1,  # 客户互动提升心情
         }
 
-    def get_daily_schedule(self) -> List[Dict[str, Any]]:
-        """获取 Alice 的日常作息"""
-        return [
-            {"time": "06:00", "activity": "wake_up", "location": "home"},
-            {"time": "06:30", "activity": "prepare_for_work", "location": "home"},
-            {"time": "07:00", "activity": "commute_to_shop", "location": "street"},
-            {"time": "07:30", "activity": "open_shop", "location": "coffee_shop"},
-            {"time": "08:00", "activity": "serve_customers", "location": "coffee_shop"},
-            {"time": "12:00", "activity": "lunch_break", "location": "coffee_shop"},
-            {"time": "13:00", "activity": "serve_customers", "location": "coffee_shop"},
-            {"time": "17:00", "activity": "close_shop", "location": "coffee_shop"},
-            {"time": "17:30", "activity": "social_time", "location": "park"},
-            {"time": "19:00", "activity": "dinner", "location": "home"},
-            {"time": "20:00", "activity": "read_book", "location": "home"},
-            {"time": "22:00", "activity": "sleep", "location": "home"},
-        ]
+    def get_daily_schedule(self) -> Tuple[Mapping[str, Any], ...]:
+        """获取 Alice 的日常作息（返回模块级只读常量）"""
+        return _DAILY_SCHEDULE
 
     def should_approach_for_conversation(self, other_agent: Dict[str, Any]) -> bool:
         """判断是否应该主动接近某人对话"""
-        # Alice 比较外向，容易主动与人交流
-        if self.personality["extraversion"] > 0.7:
-            # 如果对方在咖啡店附近或看起来需要帮助
-            distance = (
-                (other_agent["x"] - self.position.x) ** 2
-                + (other_agent["y"] - self.position.y) ** 2
-            ) ** 0.5
-
-            if distance < 3.0 and other_agent.get("state") in ["idle", "socializing"]:
-                return True
-
-        return False
-
-    def get_work_tasks(self) -> List[str]:
+        # Alice 比较外向，容易主动与人交流；先做廉价的条件判断
+        if self.personality["extraversion"] <= 0.7:
+            return False
+        if other_agent.get("state") not in _APPROACHABLE_STATES:
+            return False
+
+        # 对方在附近（比较距离平方以省去开方）
+        dx = other_agent["x"] - self.position.x
+        dy = other_agent["y"] - self.position.y
+        return dx * dx + dy * dy < _APPROACH_DISTANCE * _APPROACH_DISTANCE
+
+    def get_work_tasks(self) -> Tuple[str, ...]:
         """获取工作任务列表"""
-        return [
-            "Clean coffee machines",
-            "Prepare fresh coffee beans",
-            "Serve customers with a smile",
-            "Maintain clean and welcoming atmosphere",
-            "Try new coffee recipes",
-            "Chat with regular customers",
-            "Manage inventory",
-            "Balance daily cash register",
-        ]
+        return _WORK_TASKS
 
     async def _decide_next_action(self) -> Dict[str, Any]:
-        """Alice特定的行为决策"""
-        import random
-
-        from ai_town.core.time_manager import GameTime
-
-        current_time = GameTime.now()
-        time_of_day = GameTime.get_time_of_day()
-
-        # 根据时间和性格特征决定行为
-        if time_of_day in ["morning", "afternoon"]:
-            # 工作时间，在咖啡店
-            if self.position.area != "coffee_shop":
-                return {
-                    "type": "move",
-                    "position": {"x": 25, "y": 25, "area": "coffee_shop"},
-                    "reason": "去咖啡店工作",
-                }
-            else:
-                # 在咖啡店内的工作行为
-                work_actions = [
-                    {"type": "work", "description": "制作新鲜咖啡"},
-                    {"type": "work", "description": "清理咖啡机"},
-                    {"type": "work", "description": "招呼顾客"},
-                    {"type": "work", "description": "尝试新的咖啡配方"},
-                    {"type": "socialize", "description": "与常客聊天"},
-                ]
-                return random.choice(work_actions)
-
-        elif time_of_day == "evening":
-            # 傍晚时光，可能外出社交或继续工作
-            if self.position.area == "coffee_shop" and random.random() < 0.4:
-                # 40%概率外出
-                evening_destinations = [
-                    {"x": 50, "y": 50, "area": "park", "reason": "去公园散步"},
-                    {"x": 35, "y": 20, "area": "bookstore", "reason": "去书店看看有什么新书"},
-                    {"x": 70, "y": 40, "area": "restaurant", "reason": "去餐厅吃晚饭"},
-                    {"x": 60, "y": 55, "area": "market", "reason": "去市场买新鲜食材"},
-                ]
-                destination = random.choice(evening_destinations)
-                return {
-                    "type": "move",
-                    "position": {
-                        "x": destination["x"],
-                        "y": destination["y"],
-                        "area": destination["area"],
-                    },
-                    "reason": destination["reason"],
-                }
-            else:
-                # 继续在咖啡店或其他地方的活动
-                evening_activities = [
-                    {"type": "socialize", "description": "与朋友聊天"},
-                    {"type": "explore", "description": "探索小镇新角落"},
-                    {"type": "relax", "description": "享受悠闲时光"},
-                    {"type": "plan", "description": "计划明天的咖啡店活动"},
-                ]
-                return random.choice(evening_activities)
-
-        else:  # night
-            # 夜晚回家休息
-            if self.position.area != "house_1":
-                return {
-                    "type": "move",
-                    "position": {"x": 10, "y": 75, "area": "house_1"},
-                    "reason": "回家休息",
-                }
-            else:
-                night_activities = [
-                    {"type": "relax", "description": "阅读咖啡制作相关的书籍"},
-                    {"type": "plan", "description": "为明天准备新的咖啡配方"},
-                    {"type": "rest", "description": "准备就寝"},
-                    {"type": "think", "description": "回想今天与顾客的有趣对话"},
-                ]
-                return random.choice(night_activities)
-
-    async def _fallback_decide_action(self) -> Dict[str, Any]:
-        """Alice 的智能回退决策逻辑"""
-        return await self._decide_next_action()
-
-    def _fallback_conversation_response(self, speaker_name: str, message: str) -> str:
-        """Alice 特有的对话回应风格"""
-        message_lower = message.lower()
-
-        # 咖啡相关话题
-        if any(word in message_lower for word in ["coffee", "drink", "latte", "espresso", "brew"]):
-            responses = [
-                "哦，你也是咖啡爱好者！我很乐意为你推荐一些特别的饮品。",
-                "咖啡对我来说不只是饮品，更像是艺术品。每一杯都有自己的故事。",
-                "你有什么特别喜欢的咖啡口味吗？我一直在尝试新的配方。",
-                "一杯好咖啡真的能让整天都变得美好，不是吗？",
-            ]
-
-        # 工作相关话题
-        elif any(word in message_lower for word in ["work", "job", "busy", "shop", "business"]):
-            responses = [
-                "经营咖啡店虽然忙碌，但看到顾客因为我的咖啡而微笑，一切都值得了。",
-                "这个小镇的人们真的很棒，每天都有新的故事和有趣的对话。",
-                "我喜欢我的工作，因为它让我能够为社区带来一些温暖。",
-                "忙碌的日子让时间过得特别快，但我享受每一刻。",
-            ]
-
-        # 天气相关
-        elif any(word in message_lower for word in ["weather", "sunny", "rain", "cold", "warm"]):
-            responses = [
-                "是啊，这样的天气很适合坐在店里慢慢品味一杯热咖啡呢。",
-                "不管天气如何，总有一款咖啡适合当下的心情。",
-                "我喜欢观察不同天气下，人们对咖啡的选择也会不同。",
-                "天气变化时，咖啡就成了最好的陪伴。",
-            ]
-
-        # 问候和关心
-        elif any(word in message_lower for word in ["how", "doing", "good", "great", "fine"]):
-            responses = [
-                f"谢谢你的关心，{speaker_name}！我过得很不错，店里的生意也很好。",
-                "每天都充满新的可能性，我很享受这种感觉！你呢？",
-                "生活很美好，特别是能在这里遇见像你这样的好朋友。",
-                "我一直都很好，因为做着自己喜欢的事情。最近你怎么样？",
-            ]
-
-        # 通用友好回应
-        else:
-            responses = [
-                f"这很有趣，{speaker_name}！请告诉我更多。",
-                "我很喜欢听你分享这些，继续说吧！",
-                "你总是有这么有趣的想法，我很欣赏。",
-                "这让我想起了一些相似的经历...",
-                "谢谢你和我分享这个，真的很棒！",
-            ]
-
-        import random
-
-        return random.choice(responses)
-
-    async def decide_next_action(self) -> Dict[str, Any]:
-        """Alice 的主要决策方法"""
-        if self.use_llm_for_planning:
-            try:
-                from ai_town.core.time_manager import GameTime
-
-                context = {
-                    "current_time": GameTime.format_time(),
-                    "position": self.position.__dict__,
-                    "recent_memories": [m.description for m in self.memory.get_recent_memories(3)],
-                }
-                return await self._llm_decide_action(context)
-            except Exception as e:
-                print(f"Alice: LLM 决策失败，使用后备决策: {e}")
+        """Alice特定的行为决策：按时间段与当前是否在常驻区域查决策表"""
+        area, at_area, elsewhere = _DECISION_TABLE.get(
+            GameTime.get_time_of_day(), _DECISION_TABLE["night"]
+        )
+        pool = at_area if self.position.area == area else elsewhere
+        return _fresh_action(self._rng.choice(pool))
 
-        # 后备决策逻辑
-        return await self._decide_next_action()
+    # Alice 的智能回退决策逻辑即上面的规则决策，直接复用同一协程函数，省去一层 await
+    _fallback_decide_action = _decide_next_action
 
     async def start_conversation(self, other_agent_name: str, topic: str = "") -> str:
         """Alice 开始对话"""
@@ -470,15 +436,7 @@ class Alice(LLMEnhancedAgent):
                 print(f"Alice: LLM 对话失败，使用后备对话: {e}")
 
         # 后备对话
-        import random
-
-        greetings = [
-            f"你好，{other_agent_name}！欢迎来我的咖啡店！",
-            f"嗨 {other_agent_name}！今天想喝点什么吗？",
-            f"{other_agent_name}，很高兴见到你！我刚泡了新鲜的咖啡。",
-            f"欢迎，{other_agent_name}！坐下来聊聊天吧！",
-        ]
-        return random.choice(greetings)
+        return self._rng.choice(_GREETINGS).format(name=other_agent_name)
 
     async def respond_to_conversation(self, other_agent_name: str, message: str) -> str:
         """Alice 回应对话"""
@@ -489,32 +447,4 @@ class Alice(LLMEnhancedAgent):
                 print(f"Alice: LLM 回应失败，使用后备回应: {e}")
 
         # 后备回应逻辑
-        import random
-
-        if "咖啡" in message or "coffee" in message.lower():
-            responses = [
-                "我们有最好的咖啡豆！你想试试今天的特调吗？",
-                "咖啡是我的专长！让我为你推荐一款。",
-                "刚烘焙的豆子特别香，你一定会喜欢的。",
-            ]
-        elif "店" in message or "shop" in message.lower():
-            responses = [
-                "这家店是我的心血，我希望每个人都能感到舒适。",
-                "我努力让这里成为大家聚会聊天的好地方。",
-                "你觉得店里的氛围怎么样？",
-            ]
-        elif "朋友" in message or "friend" in message.lower():
-            responses = [
-                "我很享受和不同的人聊天，每个人都有有趣的故事。",
-                "这里的常客都是我的好朋友！",
-                "我希望能认识更多像你这样的朋友。",
-            ]
-        else:
-            responses = [
-                "真的吗？告诉我更多！",
-                "这听起来很有趣！",
-                "我喜欢听你这么说。",
-                "让我们继续聊下去！",
-            ]
-
-        return random.choice(responses)
+        return self._fallback_conversation_response(other_agent_name, message)
@@ -3,11 +3,47 @@ Charlie - LLM 增强的上班族智能体
 新来镇上的年轻办公室职员，使用大语言模型驱动适应和社交决策
 """
 
-import random
+import json
+from types import MappingProxyType
 from typing import Any, Dict, List
 
 from ai_town.agents.base_agent import Position
 from ai_town.agents.llm_enhanced_agent import LLMEnhancedAgent
+from ai_town.config_loader import get_llm_config_for_agent
+from ai_town.core.time_manager import GameTime
+from ai_town.llm.llm_integration import ask_llm
+
+# 后备对话开场白（{name} 替换为对方名字）
+_GREETINGS = (
+    "你好，{name}！我是Charlie，很高兴认识你。",
+    "嗨 {name}！我还在熟悉这个镇子，你能给我一些建议吗？",
+    "{name}，你好！我是新来的，这里的生活怎么样？",
+    "很高兴遇到你，{name}！我刚搬到这里不久。",
+)
+# 后备决策的候选行为（返回前复制，调用方可自由修改）
+_WORK_ACTIONS = (
+    MappingProxyType({"type": "work", "description": "处理工作邮件"}),
+    MappingProxyType({"type": "work", "description": "参加会议"}),
+    MappingProxyType({"type": "work", "description": "完成项目任务"}),
+    MappingProxyType({"type": "work", "description": "学习新的工作技能"}),
+)
+_EVENING_DESTINATIONS = (
+    MappingProxyType({"x": 25, "y": 25, "area": "coffee_shop", "reason": "去咖啡店放松"}),
+    MappingProxyType({"x": 35, "y": 20, "area": "bookstore", "reason": "去书店看看"}),
+    MappingProxyType({"x": 50, "y": 50, "area": "park", "reason": "去公园散步"}),
+    MappingProxyType({"x": 70, "y": 40, "area": "restaurant", "reason": "去餐厅吃晚饭"}),
+)
+_LEISURE_ACTIONS = (
+    MappingProxyType({"type": "socialize", "description": "和当地人聊天"}),
+    MappingProxyType({"type": "explore", "description": "探索周围环境"}),
+    MappingProxyType({"type": "relax", "description": "享受悠闲时光"}),
+    MappingProxyType({"type": "think", "description": "思考今天的工作"}),
+)
+_NIGHT_ACTIVITIES = (
+    MappingProxyType({"type": "rest", "description": "准备明天的工作"}),
+    MappingProxyType({"type": "relax", "description": "看书或听音乐"}),
+    MappingProxyType({"type": "sleep", "description": "准备睡觉"}),
+)
 
 
 class Charlie(LLMEnhancedAgent):
@@ -21,6 +57,94 @@ class Charlie(LLMEnhancedAgent):
     - 喜欢社交
     """
 
+    __slots__ = ("work_projects", "networking_contacts", "stress_level", "work_life_balance")
+
+    # Charlie 作为上班族的特殊偏好
+    _BEHAVIOR_PREFERENCE_OVERRIDES = MappingProxyType(
+        {
+            "work": 0.8,  # 工作认真
+            "socialize": 0.7,  # 喜欢社交
+            "network": 0.6,  # 建立人脉
+            "attend_meeting": 0.5,  # 参加会议
+            "take_lunch_break": 0.7,  # 重视午休
+            "exercise": 0.6,  # 保持健康
+            "learn_skill": 0.7,  # 学习新技能
+            "relax": 0.6,  # 放松休息
+            "explore_town": 0.5,  # 探索新环境
+            "reflect": 0.5,  # 适度思考
+        }
+    )
+
+    # Charlie 的专门行为时间
+    _ACTION_DURATION_OVERRIDES = MappingProxyType(
+        {
+            "network": 18.0,  # 建立人脉需要时间
+            "attend_meeting": 25.0,  # 会议时间
+            "take_lunch_break": 20.0,  # 午休时间
+            "commute": 12.0,  # 通勤时间
+            "exercise": 30.0,  # 锻炼时间
+            "learn_skill": 40.0,  # 学习技能
+            "relax": 15.0,  # 放松时间
+            "explore_town": 35.0,  # 探索小镇
+        }
+    )
+
+    # 洞察规则：工作记忆、新环境适应、探索活动
+    _INSIGHT_RULES = (
+        (
+            ("work", "office", "job", "project"),
+            3,
+            "我开始习惯这里的工作节奏了。" "这个办公室环境和我之前的工作很不一样。",
+        ),
+        (
+            ("meet", "talk", "conversation", "friend"),
+            2,
+            "我正在逐渐认识镇上的更多人。" "大家看起来都很友善和热情。",
+        ),
+        (
+            ("explore", "discover", "visit", "new"),
+            2,
+            "这个小镇比我想象的更有趣。" "还有很多地方值得我去探索。",
+        ),
+    )
+
+    # 回退对话规则：按顺序匹配关键词，命中第一条即从其候选回应中随机选取
+    _FALLBACK_RESPONSE_RULES = (
+        # 工作相关话题
+        (
+            ("工作", "work", "office"),
+            (
+                "是的，我在办公室工作。还在适应新的工作环境。",
+                "工作很有挑战性，但我喜欢学习新东西。",
+                "我正在努力平衡工作和生活，这个镇子很适合放松。",
+            ),
+        ),
+        # 小镇生活
+        (
+            ("镇子", "这里", "town"),
+            (
+                "这个镇子真的很棒！大家都很友善。",
+                "我还在探索，有什么地方推荐吗？",
+                "比我之前住的地方安静多了，我很喜欢。",
+            ),
+        ),
+        # 新来者的适应
+        (
+            ("新", "new"),
+            (
+                "是的，我刚搬来不久。还在适应中。",
+                "每天都有新发现，很兴奋！",
+                "虽然是新环境，但感觉很温馨。",
+            ),
+        ),
+    )
+    _FALLBACK_RESPONSES = (
+        "那很有趣！能详细说说吗？",
+        "我也有同样的感受。",
+        "谢谢你告诉我这些，{speaker_name}！",
+        "我会记住你的建议的。",
+    )
+
     def __init__(self):
         personality = {
             "extraversion": 0.6,  # 较外向
@@ -38,8 +162,6 @@ class Charlie(LLMEnhancedAgent):
         )
 
         # 从配置文件获取 LLM 设置
-        from ai_town.config_loader import get_llm_config_for_agent
-
         llm_config = get_llm_config_for_agent("charlie")
 
         super().__init__(
@@ -84,150 +206,41 @@ class Charlie(LLMEnhancedAgent):
             "sleep",  # 生理需求
         ]
 
-    def _define_behavior_preferences(self) -> Dict[str, float]:
-        """Charlie 的行为偏好"""
-        preferences = super()._define_behavior_preferences()
-
-        # Charlie 作为上班族的特殊偏好
-        preferences.update(
-            {
-                "work": 0.8,  # 工作认真
-                "socialize": 0.7,  # 喜欢社交
-                "network": 0.6,  # 建立人脉
-                "attend_meeting": 0.5,  # 参加会议
-                "take_lunch_break": 0.7,  # 重视午休
-                "exercise": 0.6,  # 保持健康
-                "learn_skill": 0.7,  # 学习新技能
-                "relax": 0.6,  # 放松休息
-                "explore_town": 0.5,  # 探索新环境
-                "reflect": 0.5,  # 适度思考
-            }
-        )
-
-        return preferences
-
-    def _define_action_durations(self) -> Dict[str, float]:
-        """Charlie 的行为持续时间"""
-        durations = super()._define_action_durations()
-
-        # Charlie 的专门行为时间
-        durations.update(
-            {
-                "network": 18.0,  # 建立人脉需要时间
-                "attend_meeting": 25.0,  # 会议时间
-                "take_lunch_break": 20.0,  # 午休时间
-                "commute": 12.0,  # 通勤时间
-                "exercise": 30.0,  # 锻炼时间
-                "learn_skill": 40.0,  # 学习技能
-                "relax": 15.0,  # 放松时间
-                "explore_town": 35.0,  # 探索小镇
-            }
-        )
-
-        return durations
-
     async def _execute_network_action(self, world_state: Dict[str, Any]) -> Dict[str, Any]:
         """执行建立人脉行动"""
-        return {
-            "type": "networking",
-            "agent_id": self.agent_id,
-            "activity": "building_professional_connections",
-            "position": {"x": self.position.x, "y": self.position.y, "area": self.position.area},
-        }
+        return self._make_action_result("networking", activity="building_professional_connections")
 
     async def _execute_attend_meeting_action(self, world_state: Dict[str, Any]) -> Dict[str, Any]:
         """执行参加会议行动"""
         meeting_type = self.current_action.get("meeting_type", "team_meeting")
-        return {
-            "type": "meeting_attendance",
-            "agent_id": self.agent_id,
-            "meeting_type": meeting_type,
-            "position": {"x": self.position.x, "y": self.position.y, "area": self.position.area},
-        }
+        return self._make_action_result("meeting_attendance", meeting_type=meeting_type)
 
     async def _execute_take_lunch_break_action(self, world_state: Dict[str, Any]) -> Dict[str, Any]:
         """执行午休行动"""
-        return {
-            "type": "lunch_break",
-            "agent_id": self.agent_id,
-            "activity": "taking_midday_rest",
-            "position": {"x": self.position.x, "y": self.position.y, "area": self.position.area},
-        }
+        return self._make_action_result("lunch_break", activity="taking_midday_rest")
 
     async def _execute_exercise_action(self, world_state: Dict[str, Any]) -> Dict[str, Any]:
         """执行锻炼行动"""
         exercise_type = self.current_action.get("exercise_type", "walking")
-        return {
-            "type": "exercising",
-            "agent_id": self.agent_id,
-            "exercise_type": exercise_type,
-            "position": {"x": self.position.x, "y": self.position.y, "area": self.position.area},
-        }
+        return self._make_action_result("exercising", exercise_type=exercise_type)
 
     async def _execute_learn_skill_action(self, world_state: Dict[str, Any]) -> Dict[str, Any]:
         """执行学习技能行动"""
         skill = self.current_action.get("skill", "professional_development")
-        return {
-            "type": "skill_learning",
-            "agent_id": self.agent_id,
-            "skill": skill,
-            "position": {"x": self.position.x, "y": self.position.y, "area": self.position.area},
-        }
+        return self._make_action_result("skill_learning", skill=skill)
 
     async def _execute_explore_town_action(self, world_state: Dict[str, Any]) -> Dict[str, Any]:
         """执行探索小镇行动"""
-        return {
-            "type": "town_exploration",
-            "agent_id": self.agent_id,
-            "activity": "discovering_local_attractions",
-            "position": {"x": self.position.x, "y": self.position.y, "area": self.position.area},
-        }
+        return self._make_action_result(
+            "town_exploration", activity="discovering_local_attractions"
+        )
 
     async def _generate_insights(self, memories):
         """生成Charlie的洞察"""
-        insights = []
-
-        # 分析工作记忆
-        work_memories = [
-            m
-            for m in memories
-            if any(word in m.description.lower() for word in ["work", "office", "job", "project"])
-        ]
-
-        if len(work_memories) >= 3:
-            insights.append("我开始习惯这里的工作节奏了。" "这个办公室环境和我之前的工作很不一样。")
-
-        # 分析新环境适应
-        social_memories = [
-            m
-            for m in memories
-            if any(
-                word in m.description.lower() for word in ["meet", "talk", "conversation", "friend"]
-            )
-        ]
-
-        if len(social_memories) >= 2:
-            insights.append("我正在逐渐认识镇上的更多人。" "大家看起来都很友善和热情。")
-
-        # 分析探索活动
-        exploration_memories = [
-            m
-            for m in memories
-            if any(
-                word in m.description.lower() for word in ["explore", "discover", "visit", "new"]
-            )
-        ]
-
-        if len(exploration_memories) >= 2:
-            insights.append("这个小镇比我想象的更有趣。" "还有很多地方值得我去探索。")
-
-        return insights[:2]
+        return self._match_insight_rules(memories)[:2]
 
     async def _llm_decide_action(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """使用 LLM 决定 Charlie 的下一个行为"""
-        from ai_town.core.time_manager import GameTime
-        from ai_town.llm.llm_integration import ask_llm
-
         current_time = GameTime.now()
         time_of_day = GameTime.get_time_of_day()
 
@@ -284,8 +297,6 @@ class Charlie(LLMEnhancedAgent):
             llm_response = await ask_llm(decision_prompt, provider=self.preferred_llm_provider)
 
             # 解析 LLM 响应
-            import json
-
             try:
                 decision = json.loads(llm_response.strip())
 
@@ -326,24 +337,6 @@ class Charlie(LLMEnhancedAgent):
             print(f"Charlie: LLM 决策失败 ({e})，使用后备决策")
             return await self._decide_next_action()
 
-    async def decide_next_action(self) -> Dict[str, Any]:
-        """Charlie 的主要决策方法"""
-        if self.use_llm_for_planning:
-            try:
-                from ai_town.core.time_manager import GameTime
-
-                context = {
-                    "current_time": GameTime.format_time(),
-                    "position": self.position.__dict__,
-                    "recent_memories": [m.description for m in self.memory.get_recent_memories(3)],
-                }
-                return await self._llm_decide_action(context)
-            except Exception as e:
-                print(f"Charlie: LLM 决策失败，使用后备决策: {e}")
-
-        # 后备决策逻辑
-        return await self._decide_next_action()
-
     async def start_conversation(self, other_agent_name: str, topic: str = "") -> str:
         """Charlie 开始对话"""
         if self.use_llm_for_conversation:
@@ -353,13 +346,7 @@ class Charlie(LLMEnhancedAgent):
                 print(f"Charlie: LLM 对话失败，使用后备对话: {e}")
 
         # 后备对话
-        greetings = [
-            f"你好，{other_agent_name}！我是Charlie，很高兴认识你。",
-            f"嗨 {other_agent_name}！我还在熟悉这个镇子，你能给我一些建议吗？",
-            f"{other_agent_name}，你好！我是新来的，这里的生活怎么样？",
-            f"很高兴遇到你，{other_agent_name}！我刚搬到这里不久。",
-        ]
-        return random.choice(greetings)
+        return self._rng.choice(_GREETINGS).format(name=other_agent_name)
 
     async def respond_to_conversation(self, other_agent_name: str, message: str) -> str:
         """Charlie 回应对话"""
@@ -370,38 +357,10 @@ class Charlie(LLMEnhancedAgent):
                 print(f"Charlie: LLM 回应失败，使用后备回应: {e}")
 
         # 后备回应
-        if "工作" in message or "office" in message.lower():
-            responses = [
-                "是的，我在办公室工作。还在适应新的工作环境。",
-                "工作很有挑战性，但我喜欢学习新东西。",
-                "我正在努力平衡工作和生活，这个镇子很适合放松。",
-            ]
-        elif "镇子" in message or "town" in message.lower() or "这里" in message:
-            responses = [
-                "这个镇子真的很棒！大家都很友善。",
-                "我还在探索，有什么地方推荐吗？",
-                "比我之前住的地方安静多了，我很喜欢。",
-            ]
-        elif "新" in message or "new" in message.lower():
-            responses = [
-                "是的，我刚搬来不久。还在适应中。",
-                "每天都有新发现，很兴奋！",
-                "虽然是新环境，但感觉很温馨。",
-            ]
-        else:
-            responses = [
-                "那很有趣！能详细说说吗？",
-                "我也有同样的感受。",
-                "谢谢你告诉我这些！",
-                "我会记住你的建议的。",
-            ]
-
-        return random.choice(responses)
+        return self._fallback_conversation_response(other_agent_name, message)
 
     async def _decide_next_action(self) -> Dict[str, Any]:
         """Charlie特定的行为决策"""
-        from ai_town.core.time_manager import GameTime
-
         current_time = GameTime.now()
         time_of_day = GameTime.get_time_of_day()
 
@@ -416,25 +375,13 @@ class Charlie(LLMEnhancedAgent):
                 }
             else:
                 # 办公室内工作行为
-                work_actions = [
-                    {"type": "work", "description": "处理工作邮件"},
-                    {"type": "work", "description": "参加会议"},
-                    {"type": "work", "description": "完成项目任务"},
-                    {"type": "work", "description": "学习新的工作技能"},
-                ]
-                return random.choice(work_actions)
+                return dict(self._rng.choice(_WORK_ACTIONS))
 
         elif time_of_day == "evening":
             # 下班后的活动
             if self.position.area == "office_1":
                 # 先离开办公室
-                evening_destinations = [
-                    {"x": 25, "y": 25, "area": "coffee_shop", "reason": "去咖啡店放松"},
-                    {"x": 35, "y": 20, "area": "bookstore", "reason": "去书店看看"},
-                    {"x": 50, "y": 50, "area": "park", "reason": "去公园散步"},
-                    {"x": 70, "y": 40, "area": "restaurant", "reason": "去餐厅吃晚饭"},
-                ]
-                destination = random.choice(evening_destinations)
+                destination = self._rng.choice(_EVENING_DESTINATIONS)
                 return {
                     "type": "move",
                     "position": {
@@ -446,13 +393,7 @@ class Charlie(LLMEnhancedAgent):
                 }
             else:
                 # 在其他地方的休闲活动
-                leisure_actions = [
-                    {"type": "socialize", "description": "和当地人聊天"},
-                    {"type": "explore", "description": "探索周围环境"},
-                    {"type": "relax", "description": "享受悠闲时光"},
-                    {"type": "think", "description": "思考今天的工作"},
-                ]
-                return random.choice(leisure_actions)
+                return dict(self._rng.choice(_LEISURE_ACTIONS))
 
         else:  # night
             # 夜晚回家休息
@@ -463,9 +404,4 @@ class Charlie(LLMEnhancedAgent):
                     "reason": "回家休息",
                 }
             else:
-                night_activities = [
-                    {"type": "rest", "description": "准备明天的工作"},
-                    {"type": "relax", "description": "看书或听音乐"},
-                    {"type": "sleep", "description": "准备睡觉"},
-                ]
-                return random.choice(night_activities)
+                return dict(self._rng.choice(_NIGHT_ACTIVITIES))
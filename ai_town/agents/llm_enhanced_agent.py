@@ -5,22 +5,95 @@ LLM 增强的智能体基类
 
 import asyncio
 import json
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+import re
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
 
 from ai_town.agents.base_agent import BaseAgent, Observation, Position
 from ai_town.core.time_manager import GameTime
 from ai_town.llm.llm_integration import ask_llm, chat_with_llm, llm_manager
 
+# LLM 行为决策的固定指令（与人设一起放在 system 消息中，不随时间步变化）
+_DECISION_INSTRUCTIONS = """基于你的性格、当前情况和最近经历，你接下来想要做什么？
+请从以下行为类型中选择一个：
+
+1. move - 移动到新位置
+2. work - 工作相关活动
+3. socialize - 社交互动
+4. explore - 探索环境
+5. relax - 放松休息
+6. think - 思考反思
+7. sleep - 睡觉休息
+
+重要：请严格按照以下JSON格式回答，不要添加任何额外文字：
+
+{"type": "work", "description": "整理书架", "reason": "现在是工作时间"}"""
+
+# LLM 结果缓存的有效期（游戏时间）：超过一天的条目视为过期，重新调用 LLM
+_LLM_CACHE_TTL = timedelta(days=1)
+
+# 决策缓存键中的记忆部分只取最近最重要的几条（重要性不低于阈值），
+# 日常的低重要性观察（看到某人、普通事件）不会让缓存失效
+_DECISION_KEY_MIN_IMPORTANCE = 5.0
+_DECISION_KEY_TOP_K = 3
+
 
 class LLMEnhancedAgent(BaseAgent):
     """LLM 增强的智能体基类"""
 
-    def __init__(self, *args, **kwargs):
+    __slots__ = (
+        "preferred_llm_provider",
+        "use_llm_for_planning",
+        "use_llm_for_conversation",
+        "use_llm_for_reflection",
+        "conversation_history",
+        "current_thoughts",
+        "current_goals",
+        "_persona_prompt",
+        "_persona_source",
+        "_static_persona",
+        "_response_cache",
+        "_decision_cache",
+    )
+
+    # 回退对话规则：(关键词, 候选回应)，按顺序取第一条命中的规则，子类按需定义
+    # 候选回应中的 {speaker_name} 会替换为说话者名字
+    _FALLBACK_RESPONSE_RULES: Tuple[Tuple[Tuple[str, ...], Tuple[str, ...]], ...] = ()
+    _FALLBACK_RESPONSES: Tuple[str, ...] = (
+        "是的，我明白你的意思。",
+        "这很有趣！",
+        "你说得对。",
+        "我也有同感。",
+        "谢谢你告诉我这个，{speaker_name}。",
+    )
+    _compiled_response_rules: Tuple[Tuple["re.Pattern", Tuple[str, ...]], ...] = ()
+
+    # LLM 结果缓存容量（对话回应与行为决策各自独立），按最近使用淘汰
+    _RESPONSE_CACHE_SIZE = 1024
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # 类创建时将回退对话规则的关键词预编译为正则，每次回应直接复用
+        cls._compiled_response_rules = tuple(
+            (re.compile("|".join(map(re.escape, keywords))), responses)
+            for keywords, responses in cls._FALLBACK_RESPONSE_RULES
+        )
+
+    def __init__(self, *args, llm_provider: str = "mock", **kwargs):
+        # LLM 结果缓存，容量与有效期见 _cache_get / _cache_put。须在 super().__init__ 之前创建：
+        # BaseAgent.__init__ 设置职业时会触发 _render_persona 清空缓存
+        # 对话回应：(对话对象, 归一化消息, 对话历史指纹) -> (回应, 生成时间)
+        self._response_cache: "OrderedDict[Tuple[str, str, int], Tuple[str, datetime]]" = (
+            OrderedDict()
+        )
+        # 行为决策：(整点时间, 区域, 最近重要记忆) -> (决策, 生成时间)
+        self._decision_cache: "OrderedDict[Tuple, Tuple[Dict[str, Any], datetime]]" = OrderedDict()
+
         super().__init__(*args, **kwargs)
 
         # LLM 相关配置
-        self.preferred_llm_provider = kwargs.get("llm_provider", "mock")
+        self.preferred_llm_provider = llm_provider
         self.use_llm_for_planning = True
         self.use_llm_for_conversation = True
         self.use_llm_for_reflection = True
@@ -32,6 +105,51 @@ class LLMEnhancedAgent(BaseAgent):
         self.current_thoughts = ""
         self.current_goals = []
 
+    @BaseAgent.occupation.setter
+    def occupation(self, value: str):
+        BaseAgent.occupation.fset(self, value)
+        # 人设文本包含职业，职业变化时重新生成（BaseAgent.__init__ 设置职业时完成首次生成）
+        self._render_persona()
+
+    def _refresh_persona(self):
+        """姓名、年龄、职业或背景变化后重新生成人设（并作废基于旧人设的缓存）"""
+        if self._persona_source != (self.name, self.age, self.occupation, self.background):
+            self._render_persona()
+
+    def _render_persona(self):
+        """
+        生成 LLM 提示词使用的人设文本，各次 LLM 调用直接复用
+
+        _static_persona 为人设加决策指令，作为 system 消息前缀保持逐字不变；
+        时间、位置、记忆等易变内容放在其后的 user 消息中，以便命中服务端的提示词前缀缓存。
+        """
+        self._persona_prompt = (
+            f"你是{self.name}，{self.age}岁，{self.occupation}。{self.background}"
+        )
+        self._static_persona = f"{self._persona_prompt}\n\n{_DECISION_INSTRUCTIONS}"
+        self._persona_source = (self.name, self.age, self.occupation, self.background)
+        # 缓存的对话回应与决策基于旧人设生成，人设变化时一并作废
+        self._response_cache.clear()
+        self._decision_cache.clear()
+
+    def _cache_get(self, cache: OrderedDict, key: Tuple) -> Any:
+        """读取 LLM 结果缓存，未命中或已过期时返回 None"""
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        value, created_at = entry
+        if GameTime.now() - created_at > _LLM_CACHE_TTL:
+            del cache[key]
+            return None
+        cache.move_to_end(key)
+        return value
+
+    def _cache_put(self, cache: OrderedDict, key: Tuple, value: Any):
+        """写入 LLM 结果缓存，超出容量时淘汰最久未使用的条目"""
+        cache[key] = (value, GameTime.now())
+        if len(cache) > self._RESPONSE_CACHE_SIZE:
+            cache.popitem(last=False)
+
     async def _generate_insights(self, memories: List[Observation]) -> List[str]:
         """使用 LLM 生成基于记忆的洞察"""
         if not self.use_llm_for_reflection or not memories:
@@ -277,18 +395,15 @@ class LLMEnhancedAgent(BaseAgent):
             return self._fallback_conversation_response(speaker_name, message)
 
     def _fallback_conversation_response(self, speaker_name: str, message: str) -> str:
-        """回退的对话响应"""
-        responses = [
-            "是的，我明白你的意思。",
-            "这很有趣！",
-            "你说得对。",
-            "我也有同感。",
-            f"谢谢你告诉我这个，{speaker_name}。",
-        ]
-
-        import random
+        """回退的对话响应：按类上预编译的关键词规则选择候选回应"""
+        message_lower = message.lower()
+        responses = self._FALLBACK_RESPONSES
+        for pattern, candidates in self._compiled_response_rules:
+            if pattern.search(message_lower):
+                responses = candidates
+                break
 
-        return random.choice(responses)
+        return self._rng.choice(responses).format(speaker_name=speaker_name)
 
     async def set_goals(self, goals: List[str]):
         """设置当前目标"""
@@ -328,13 +443,38 @@ class LLMEnhancedAgent(BaseAgent):
         )
         return base_status
 
-    async def _llm_decide_action(self, context: Dict[str, Any]) -> Dict[str, Any]:
-        """使用 LLM 决定下一个行为"""
-        from ai_town.llm.llm_integration import ask_llm
+    def _build_decision_context(self) -> Dict[str, Any]:
+        """构建 LLM 决策所需的上下文（仅读取内存中的状态）"""
+        return {
+            "current_time": GameTime.format_time(),
+            "position": self.position.to_dict(),
+            "recent_memories": self.memory.get_recent_descriptions(hours_back=3),
+            "important_memories": tuple(
+                memory.description
+                for memory in self.memory.get_memories_by_importance(
+                    _DECISION_KEY_MIN_IMPORTANCE, hours_back=3
+                )[:_DECISION_KEY_TOP_K]
+            ),
+        }
 
-        # 构建决策上下文
-        personality_desc = f"你是{self.name}，{self.age}岁，{self.occupation}。{self.background}"
+    async def decide_next_action(self) -> Dict[str, Any]:
+        """
+        主要决策方法：优先由 LLM 决策，失败时使用后备决策
+
+        上下文为同步的内存读取，且 LLM 调用依赖它，二者没有可重叠的等待；
+        多个智能体之间的决策由调用方并发调度（asyncio.gather）。
+        """
+        if self.use_llm_for_planning:
+            try:
+                return await self._llm_decide_action(self._build_decision_context())
+            except Exception as e:
+                print(f"{self.name}: LLM 决策失败，使用后备决策: {e}")
 
+        # 后备决策逻辑
+        return await self._decide_next_action()
+
+    async def _llm_decide_action(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """使用 LLM 决定下一个行为"""
         situation_desc = (
             f"当前时间: {context.get('current_time', '未知')}，"
             f"位置: {context.get('position', {}).get('area', '未知区域')}。"
@@ -346,39 +486,29 @@ class LLMEnhancedAgent(BaseAgent):
             else "暂无最近经历"
         )
 
-        # 构建决策提示
-        decision_prompt = f"""
-{personality_desc}
-
-{situation_desc}
-
-{memory_desc}
-
-基于你的性格、当前情况和最近经历，你接下来想要做什么？
-请从以下行为类型中选择一个：
-
-1. move - 移动到新位置
-2. work - 工作相关活动  
-3. socialize - 社交互动
-4. explore - 探索环境
-5. relax - 放松休息
-6. think - 思考反思
-7. sleep - 睡觉休息
-
-重要：请严格按照以下JSON格式回答，不要添加任何额外文字：
+        self._refresh_persona()
 
-{{"type": "work", "description": "整理书架", "reason": "现在是工作时间"}}
+        # 情境量化：同一小时内、同一区域且最近的重要记忆相同时复用先前的决策
+        cache_key = (
+            context.get("current_time", "")[:13],
+            context.get("position", {}).get("area"),
+            tuple(context.get("important_memories", ())),
+        )
+        cached = self._cache_get(self._decision_cache, cache_key)
+        if cached is not None:
+            return dict(cached)
 
-JSON响应："""
+        # 静态人设在前（可被缓存），本步的情境与记忆在后
+        messages = [
+            {"role": "system", "content": self._static_persona},
+            {"role": "user", "content": f"{situation_desc}\n\n{memory_desc}\n\nJSON响应："},
+        ]
 
         try:
             # 调用 LLM
-            llm_response = await ask_llm(decision_prompt, provider=self.preferred_llm_provider)
+            llm_response = await chat_with_llm(messages, provider=self.preferred_llm_provider)
 
             # 解析 LLM 响应
-            import json
-            import re
-
             try:
                 # 清理响应文本
                 cleaned_response = llm_response.strip()
@@ -405,11 +535,13 @@ JSON响应："""
 
                 # 解析 JSON
                 decision = json.loads(cleaned_response)
-                return {
+                action = {
                     "type": decision.get("type", "think"),
                     "description": decision.get("description", "思考当前情况"),
                     "reason": decision.get("reason", ""),
                 }
+                self._cache_put(self._decision_cache, cache_key, action)
+                return dict(action)
 
             except (json.JSONDecodeError, AttributeError) as e:
                 print(f"JSON 解析失败: {e}, 原始响应: {llm_response[:100]}...")
@@ -422,12 +554,9 @@ JSON响应："""
 
     async def _llm_start_conversation(self, other_agent_name: str, topic: str = "") -> str:
         """使用 LLM 开始对话"""
-        from ai_town.llm.llm_integration import ask_llm
-
-        personality_desc = f"你是{self.name}，{self.age}岁，{self.occupation}。{self.background}"
-
+        self._refresh_persona()
         conversation_prompt = f"""
-{personality_desc}
+{self._persona_prompt}
 
 你想要和 {other_agent_name} 开始对话。
 {f'话题: {topic}' if topic else ''}
@@ -443,20 +572,30 @@ JSON响应："""
             return f"你好，{other_agent_name}！很高兴见到你。"
 
     async def _llm_respond_to_conversation(self, other_agent_name: str, message: str) -> str:
-        """使用 LLM 回应对话"""
-        from ai_town.llm.llm_integration import chat_with_llm
+        """使用 LLM 回应对话（同一对象的重复消息直接复用缓存的回应）"""
+        self._refresh_persona()
 
         # 获取或初始化对话历史
         if other_agent_name not in self.conversation_history:
             self.conversation_history[other_agent_name] = []
 
         conversation_history = self.conversation_history[other_agent_name]
+        recent_history = conversation_history[-10:]
 
-        # 构建对话上下文
-        personality_desc = f"你是{self.name}，{self.age}岁，{self.occupation}。{self.background}"
+        # 键中包含发给 LLM 的对话历史的指纹：同一句话在对话的不同阶段应得到不同回应
+        cache_key = (
+            other_agent_name,
+            " ".join(message.lower().split()),
+            hash(tuple(msg["content"] for msg in recent_history)),
+        )
+        cached = self._cache_get(self._response_cache, cache_key)
+        if cached is not None:
+            self._record_exchange(other_agent_name, message, cached)
+            return cached
 
+        # 构建对话上下文
         messages = [
-            {"role": "system", "content": personality_desc},
+            {"role": "system", "content": self._persona_prompt},
             {
                 "role": "system",
                 "content": f"你正在和 {other_agent_name} 对话。请用1句话简短回应（不超过30字），保持你的性格特征。",
@@ -464,8 +603,7 @@ JSON响应："""
         ]
 
         # 添加对话历史（最近5轮）
-        for msg in conversation_history[-10:]:
-            messages.append(msg)
+        messages.extend(recent_history)
 
         # 添加当前消息
         messages.append({"role": "user", "content": f"{other_agent_name}: {message}"})
@@ -482,19 +620,23 @@ JSON响应："""
                 if cleaned_response.startswith(prefix):
                     cleaned_response = cleaned_response[len(prefix) :].strip()
 
-            # 保存对话历史
-            conversation_history.append(
-                {"role": "user", "content": f"{other_agent_name}: {message}"}
-            )
-            conversation_history.append({"role": "assistant", "content": cleaned_response})
-
-            # 限制对话历史长度
-            if len(conversation_history) > 20:
-                conversation_history = conversation_history[-20:]
-                self.conversation_history[other_agent_name] = conversation_history
+            # 只缓存有效回应（LLM 不可用时的占位文本不缓存）
+            if cleaned_response and not cleaned_response.startswith("[LLM"):
+                self._cache_put(self._response_cache, cache_key, cleaned_response)
 
+            self._record_exchange(other_agent_name, message, cleaned_response)
             return cleaned_response
 
-        except Exception as e:
+        except Exception:
             # 后备回应
-            return f"谢谢你告诉我这些，{other_agent_name}。"
+            return self._fallback_conversation_response(other_agent_name, message)
+
+    def _record_exchange(self, other_agent_name: str, message: str, response: str):
+        """保存一轮对话到历史"""
+        conversation_history = self.conversation_history[other_agent_name]
+        conversation_history.append({"role": "user", "content": f"{other_agent_name}: {message}"})
+        conversation_history.append({"role": "assistant", "content": response})
+
+        # 限制对话历史长度
+        if len(conversation_history) > 20:
+            self.conversation_history[other_agent_name] = conversation_history[-20:]
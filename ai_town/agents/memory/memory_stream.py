@@ -8,10 +8,33 @@ import math
 import os
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 from ai_town.core.time_manager import GameTime
 
+# 时间戳列的计量起点（记忆时间均为无时区的游戏时间）
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_us(timestamp: datetime) -> int:
+    """将时间转换为自 _EPOCH 起的整数微秒，保证与 datetime 比较结果完全一致"""
+    return (timestamp - _EPOCH) // _MICROSECOND
+
+
+def keyword_mask(text: str, vocabulary: Sequence[str]) -> int:
+    """
+    将文本编码为关键词位掩码：vocabulary 中第 i 个词（不区分大小写的子串）出现时置第 i 位
+    """
+    text = text.lower()
+    mask = 0
+    for bit, word in enumerate(vocabulary):
+        if word in text:
+            mask |= 1 << bit
+    return mask
+
 
 @dataclass
 class Memory:
@@ -25,6 +48,7 @@ class Memory:
     last_accessed: Optional[datetime] = None
     keywords: List[str] = None
     metadata: Dict[str, Any] = None
+    kw_mask: int = 0  # 按所属记忆流词表编码的关键词位掩码（见 keyword_mask）
 
     def __post_init__(self):
         if self.keywords is None:
@@ -71,6 +95,48 @@ class Memory:
         return alpha * recency + beta * importance + gamma * relevance
 
 
+class _MemoryColumns:
+    """
+    记忆的列式索引
+
+    与记忆列表逐条对应，保存按时间 / 重要性筛选时需要的两列，
+    使筛选成为一次数组运算，而不必逐条访问 Memory 对象。
+    """
+
+    __slots__ = ("size", "_ts", "_importance")
+
+    _INITIAL_CAPACITY = 64
+
+    def __init__(self):
+        self.size = 0
+        self._ts = np.empty(self._INITIAL_CAPACITY, dtype=np.int64)
+        self._importance = np.empty(self._INITIAL_CAPACITY, dtype=np.float64)
+
+    def append(self, memory: Memory):
+        """追加一条记忆的列数据"""
+        if self.size == len(self._ts):
+            capacity = len(self._ts) * 2
+            self._ts = np.resize(self._ts, capacity)
+            self._importance = np.resize(self._importance, capacity)
+        self._ts[self.size] = _to_us(memory.timestamp)
+        self._importance[self.size] = memory.importance
+        self.size += 1
+
+    def rebuild(self, memories: List[Memory]):
+        """按记忆列表重建（列表被外部修改后调用）"""
+        self.size = 0
+        for memory in memories:
+            self.append(memory)
+
+    @property
+    def ts(self) -> np.ndarray:
+        return self._ts[: self.size]
+
+    @property
+    def importance(self) -> np.ndarray:
+        return self._importance[: self.size]
+
+
 class MemoryStream:
     """
     记忆流管理器
@@ -82,8 +148,17 @@ class MemoryStream:
     - 反思触发
     """
 
-    def __init__(self, agent_id: str):
+    # 达到该重要性的记忆会被记录最近时间，供规划判断是否需要调整计划
+    IMPORTANT_THRESHOLD = 7.0
+
+    def __init__(self, agent_id: str, vocabulary: Sequence[str] = ()):
+        """
+        Args:
+            agent_id: 智能体ID
+            vocabulary: 关键词词表，写入记忆时据此计算 kw_mask，供反思时按位匹配
+        """
         self.agent_id = agent_id
+        self.vocabulary = tuple(vocabulary)
         self.observations: List[Memory] = []
         self.reflections: List[Memory] = []
 
@@ -91,6 +166,13 @@ class MemoryStream:
         self.reflection_threshold = 150  # 累积重要性阈值
         self.importance_sum = 0.0
 
+        # 最近一条重要记忆的时间（避免每步扫描全部记忆）
+        self._last_important_ts: Optional[datetime] = None
+
+        # 与 observations / reflections 对应的列式索引，供批量筛选
+        self._observation_columns = _MemoryColumns()
+        self._reflection_columns = _MemoryColumns()
+
         # 环境变量开关
         # AI_TOWN_MEMORY_PERSIST: 是否持久化到磁盘（默认开启）
         # AI_TOWN_MEMORY_LOAD: 是否从磁盘加载历史记忆（默认开启）
@@ -127,6 +209,7 @@ class MemoryStream:
             description=observation.description,
             importance=observation.importance,
             keywords=self._extract_keywords(observation.description),
+            kw_mask=keyword_mask(observation.description, self.vocabulary),
             metadata={
                 "event_type": observation.event_type,
                 "location": {
@@ -140,7 +223,9 @@ class MemoryStream:
         )
 
         self.observations.append(memory)
+        self._observation_columns.append(memory)
         self.importance_sum += memory.importance
+        self._note_important(memory)
 
         # 保存到磁盘
         self._save_memory(memory)
@@ -155,10 +240,13 @@ class MemoryStream:
             description=insight,
             importance=importance,
             keywords=self._extract_keywords(insight),
+            kw_mask=keyword_mask(insight, self.vocabulary),
             metadata={"type": "reflection"},
         )
 
         self.reflections.append(memory)
+        self._reflection_columns.append(memory)
+        self._note_important(memory)
 
         # 保存到磁盘
         self._save_memory(memory)
@@ -202,35 +290,65 @@ class MemoryStream:
 
     def get_recent_memories(self, hours_back: int = 24, limit: int = 50) -> List[Memory]:
         """获取最近的记忆"""
-        cutoff_time = GameTime.now() - timedelta(hours=hours_back)
+        order, memories = self._recent_order(hours_back, limit)
+        return [memories[i] for i in order]
 
-        recent_memories = [
-            memory
-            for memory in self.observations + self.reflections
-            if memory.timestamp >= cutoff_time
-        ]
+    def get_recent_descriptions(self, hours_back: int = 24, limit: int = 50) -> Tuple[str, ...]:
+        """获取最近记忆的描述（顺序与 get_recent_memories 一致），供拼接提示词直接使用"""
+        order, memories = self._recent_order(hours_back, limit)
+        return tuple(memories[i].description for i in order)
 
-        # 按时间排序
-        recent_memories.sort(key=lambda x: x.timestamp, reverse=True)
+    def _recent_order(self, hours_back: int, limit: int):
+        """返回 (最近记忆的下标，按时间从新到旧, 合并后的记忆列表)"""
+        cutoff = _to_us(GameTime.now() - timedelta(hours=hours_back))
+        ts, _, memories = self._columns()
 
-        return recent_memories[:limit]
+        # 按时间从新到旧排序（时间相同时保持原有先后顺序）
+        selected = np.flatnonzero(ts >= cutoff)
+        order = selected[np.argsort(-ts[selected], kind="stable")][:limit]
+        return order.tolist(), memories
 
     def get_memories_by_importance(
         self, min_importance: float = 5.0, hours_back: int = 24
     ) -> List[Memory]:
         """获取重要的记忆"""
-        cutoff_time = GameTime.now() - timedelta(hours=hours_back)
+        cutoff = _to_us(GameTime.now() - timedelta(hours=hours_back))
+        ts, importance, memories = self._columns()
+
+        # 按重要性从高到低排序（重要性相同时保持原有先后顺序）
+        selected = np.flatnonzero((ts >= cutoff) & (importance >= min_importance))
+        order = selected[np.argsort(-importance[selected], kind="stable")]
+        return [memories[i] for i in order]
 
-        important_memories = [
-            memory
-            for memory in self.observations + self.reflections
-            if (memory.timestamp >= cutoff_time and memory.importance >= min_importance)
-        ]
+    def _columns(self):
+        """
+        返回观察与反思合并后的 (时间列, 重要性列, 记忆列表)，顺序与 observations + reflections 一致
+        """
+        for columns, memories in (
+            (self._observation_columns, self.observations),
+            (self._reflection_columns, self.reflections),
+        ):
+            if columns.size != len(memories):
+                columns.rebuild(memories)
+
+        obs, refl = self._observation_columns, self._reflection_columns
+        return (
+            np.concatenate((obs.ts, refl.ts)),
+            np.concatenate((obs.importance, refl.importance)),
+            self.observations + self.reflections,
+        )
 
-        # 按重要性排序
-        important_memories.sort(key=lambda x: x.importance, reverse=True)
+    @property
+    def last_important_ts(self) -> Optional[datetime]:
+        """最近一条重要记忆（importance >= IMPORTANT_THRESHOLD）的时间"""
+        return self._last_important_ts
 
-        return important_memories
+    def _note_important(self, memory: Memory):
+        """记录重要记忆的时间"""
+        if memory.importance >= self.IMPORTANT_THRESHOLD and (
+            self._last_important_ts is None or memory.timestamp > self._last_important_ts
+        ):
+            self._last_important_ts = memory.timestamp
 
     def should_reflect(self) -> bool:
         """判断是否应该进行反思"""
@@ -394,13 +512,17 @@ class MemoryStream:
                         ),
                         keywords=data.get("keywords", []),
                         metadata=data.get("metadata", {}),
+                        kw_mask=keyword_mask(data["description"], self.vocabulary),
                     )
 
                     # 根据类型添加到对应列表
                     if memory.metadata.get("type") == "reflection":
                         self.reflections.append(memory)
+                        self._reflection_columns.append(memory)
                     else:
                         self.observations.append(memory)
+                        self._observation_columns.append(memory)
+                    self._note_important(memory)
 
                 except Exception as e:
                     print(f"Error loading memory from {filepath}: {e}")
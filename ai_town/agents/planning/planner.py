@@ -201,10 +201,9 @@ class ActionPlanner:
             needs["exploration"] = max(needs["exploration"], 0.3)
 
         # 轻微随机扰动，避免行为单一（保持小幅度，0.9~1.1）
-        import random as _rand
-
+        rng = self.agent._rng
         for k in needs:
-            needs[k] = max(0.0, min(1.0, needs[k] * (0.9 + 0.2 * _rand.random())))
+            needs[k] = max(0.0, min(1.0, needs[k] * (0.9 + 0.2 * rng.random())))
 
         return needs
 
@@ -333,10 +332,9 @@ class ActionPlanner:
         extraversion = float(self.agent.personality.get("extraversion", 0.5))
 
         # 内向者大概率选择安静活动替代直接社交
-        import random as _rand
-
-        if extraversion < 0.5 and _rand.random() < (0.7 - extraversion):
-            quiet_choice = _rand.choice(
+        rng = self.agent._rng
+        if extraversion < 0.5 and rng.random() < (0.7 - extraversion):
+            quiet_choice = rng.choice(
                 [
                     {"type": "reflect", "duration": 10, "description": "Take some quiet time"},
                     {"type": "read", "duration": 15, "description": "Read quietly"},
@@ -611,9 +609,7 @@ class ActionPlanner:
             ],
         }
 
-        import random
-
-        return random.choice(greetings.get(time_of_day, greetings["afternoon"]))
+        return self.agent._rng.choice(greetings.get(time_of_day, greetings["afternoon"]))
 
     def add_goal(self, goal: Goal):
         """添加新目标"""
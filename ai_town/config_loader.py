@@ -4,6 +4,7 @@ AI Town 配置加载器
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict
 
@@ -57,8 +58,14 @@ def load_env_file(env_path: Path = None) -> Dict[str, str]:
     return config
 
 
+@lru_cache(maxsize=32)
 def get_llm_config_for_agent(agent_name: str) -> Dict[str, Any]:
-    """获取指定智能体的 LLM 配置"""
+    """
+    获取指定智能体的 LLM 配置
+
+    配置在 ai_town.config 导入时即已确定，结果按智能体名缓存，多次创建同名智能体只构建一次；
+    返回的字典为共享对象，调用方只读取、不要修改。
+    """
     try:
         from ai_town.config import AGENT_LLM_CONFIG, LLM_CONFIG
     except ImportError:
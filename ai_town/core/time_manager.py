@@ -4,6 +4,7 @@
 """
 
 import asyncio
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -16,6 +17,7 @@ class GameTime:
     """
 
     _start_time: Optional[datetime] = None
+    _start_ts: float = 0.0  # _start_time 对应的时间戳（秒），供 seconds_now 免去 datetime 运算
     _time_multiplier: float = 1.0  # 时间加速倍数
     _paused: bool = False
 
@@ -29,6 +31,7 @@ class GameTime:
             time_multiplier: 时间加速倍数，1.0为正常速度
         """
         cls._start_time = start_time or datetime.now()
+        cls._start_ts = cls._start_time.timestamp()
         cls._time_multiplier = time_multiplier
         cls._paused = False
 
@@ -45,11 +48,23 @@ class GameTime:
         game_elapsed = timedelta(seconds=real_elapsed.total_seconds() * cls._time_multiplier)
         return cls._start_time + game_elapsed
 
+    @classmethod
+    def seconds_now(cls) -> float:
+        """获取当前游戏时间的时间戳（秒），与 now().timestamp() 对应，但不创建 datetime 对象"""
+        if cls._start_time is None:
+            cls.initialize()
+
+        if cls._paused:
+            return cls._start_ts
+
+        return cls._start_ts + (time.time() - cls._start_ts) * cls._time_multiplier
+
     @classmethod
     def set_multiplier(cls, multiplier: float):
         """设置时间加速倍数"""
         current_time = cls.now()
         cls._start_time = current_time
+        cls._start_ts = current_time.timestamp()
         cls._time_multiplier = multiplier
 
     @classmethod
@@ -62,6 +77,7 @@ class GameTime:
         """恢复时间"""
         if cls._paused:
             cls._start_time = datetime.now()
+            cls._start_ts = cls._start_time.timestamp()
             cls._paused = False
 
     @classmethod
@@ -8,11 +8,12 @@ import json
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from ai_town.agents.base_agent import BaseAgent, Observation, Position
+from ai_town.agents.base_agent import AgentState, BaseAgent, Observation, Position
 from ai_town.core.time_manager import GameTime
 from ai_town.environment.map import GameMap
+from ai_town.environment.spatial import VECTORIZE_THRESHOLD, SpatialGrid, positions_to_array
 
 
 @dataclass
@@ -65,6 +66,7 @@ class World:
         # 配置
         self.step_interval = 1.0  # 秒
         self.max_events = 100  # 最大同时事件数
+        self.max_concurrent_steps = 16  # 同时执行时间步的智能体数量上限
 
         # 统计信息
         self.stats = {
@@ -105,6 +107,16 @@ class World:
         Args:
             for_agent_id: 如果指定，返回该智能体视角的世界状态
         """
+        world_state, agent_positions = self._build_shared_world_state()
+
+        # 如果是特定智能体的视角，添加附近智能体信息
+        if for_agent_id and for_agent_id in self.agents:
+            self._add_nearby_agents(world_state, self.agents[for_agent_id], agent_positions)
+
+        return world_state
+
+    def _build_shared_world_state(self) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        """构建与视角无关的世界状态，返回 (世界状态, 智能体位置表)"""
         agent_positions = {}
         for agent_id, agent in self.agents.items():
             agent_positions[agent_id] = {
@@ -113,7 +125,7 @@ class World:
                 "x": agent.position.x,
                 "y": agent.position.y,
                 "area": agent.position.area,
-                "state": agent.state.value,
+                "state": agent.state.label,
                 "energy": agent.energy,
                 "mood": agent.mood,
             }
@@ -127,16 +139,39 @@ class World:
             "events": [self._serialize_event(event) for event in self.current_events],
             "map_data": self.map.get_map_data(),
         }
+        if len(world_state["events"]) >= VECTORIZE_THRESHOLD:
+            world_state["events_xy"] = positions_to_array(world_state["events"])
+
+        return world_state, agent_positions
+
+    def _build_agent_grid(
+        self, agent_positions: Dict[str, Dict[str, Any]]
+    ) -> Optional[SpatialGrid]:
+        """智能体较多时按感知半径构建空间网格，使每个智能体的邻近查询只检查附近网格"""
+        if len(agent_positions) < VECTORIZE_THRESHOLD:
+            return None
+        cell_size = max(1.0, max(agent.perception_radius for agent in self.agents.values()))
+        return SpatialGrid(
+            positions_to_array(list(agent_positions.values())),
+            cell_size,
+            items=list(agent_positions.items()),
+        )
 
-        # 如果是特定智能体的视角，添加附近智能体信息
-        if for_agent_id and for_agent_id in self.agents:
-            agent = self.agents[for_agent_id]
-            nearby_agents = self.map.get_nearby_agents(
-                agent.position.x, agent.position.y, agent.perception_radius, agent_positions
-            )
-            world_state["nearby_agents"] = nearby_agents
-
-        return world_state
+    def _add_nearby_agents(
+        self,
+        world_state: Dict[str, Any],
+        agent: BaseAgent,
+        agent_positions: Dict[str, Dict[str, Any]],
+        grid: Optional[SpatialGrid] = None,
+    ):
+        """向世界状态中添加某个智能体感知范围内的其他智能体"""
+        nearby_agents = self.map.get_nearby_agents(
+            agent.position.x, agent.position.y, agent.perception_radius, agent_positions, grid
+        )
+        world_state["nearby_agents"] = nearby_agents
+        # 候选较多时附带坐标数组，供智能体感知时直接做向量化过滤
+        if len(nearby_agents) >= VECTORIZE_THRESHOLD:
+            world_state["nearby_agents_xy"] = positions_to_array(nearby_agents)
 
     async def step(self) -> Dict[str, Any]:
         """
@@ -151,11 +186,22 @@ class World:
         # 清理过期事件
         self._cleanup_expired_events()
 
-        # 并行执行所有智能体的步骤
+        # 并行执行所有智能体的步骤（并发数受 max_concurrent_steps 限制）
+        semaphore = asyncio.Semaphore(self.max_concurrent_steps)
+
+        async def _bounded_step(agent: BaseAgent, world_state: Dict[str, Any]):
+            async with semaphore:
+                return await agent.step(world_state, self.last_step_time)
+
+        # 与视角无关的部分每步只构建一次，各智能体在副本上添加各自的附近智能体
+        shared_state, agent_positions = self._build_shared_world_state()
+        grid = self._build_agent_grid(agent_positions)
+
         agent_tasks = []
         for agent in self.agents.values():
-            world_state = self.get_world_state(agent.agent_id)
-            task = asyncio.create_task(agent.step(world_state))
+            world_state = dict(shared_state)
+            self._add_nearby_agents(world_state, agent, agent_positions, grid)
+            task = asyncio.create_task(_bounded_step(agent, world_state))
             agent_tasks.append((agent.agent_id, task))
 
         # 等待所有智能体完成步骤
@@ -260,8 +306,7 @@ class World:
         message = action.get("message", "")
 
         # 计算距离，确保在对话范围内
-        distance = speaker.position.distance_to(target.position)
-        if distance > speaker.conversation_radius:
+        if not speaker.position.within_radius(target.position, speaker.conversation_radius):
             return
 
         # 发送消息给目标智能体
@@ -316,13 +361,11 @@ class World:
 
         for i, agent1 in enumerate(agent_list):
             for agent2 in agent_list[i + 1 :]:
-                distance = agent1.position.distance_to(agent2.position)
-
                 # 如果距离很近且都处于社交状态，可能发生自动交互
                 if (
-                    distance <= 2.0
-                    and agent1.state.value in ["idle", "socializing"]
-                    and agent2.state.value in ["idle", "socializing"]
+                    agent1.position.within_radius(agent2.position, 2.0)
+                    and agent1.state in (AgentState.IDLE, AgentState.SOCIALIZING)
+                    and agent2.state in (AgentState.IDLE, AgentState.SOCIALIZING)
                 ):
 
                     # 成对冷却：十分钟内重复相同对话不再自动触发
@@ -477,6 +520,7 @@ class World:
             print("\n⏹️ 用户中断了模拟")
         finally:
             self.is_running = False
+            await self.finish_reflections()
             print(f"📊 模拟结束，共进行了 {self.step_count} 步")
             print(f"📈 总互动次数: {self.stats['total_interactions']}")
             print(f"🚶 总移动次数: {self.stats['total_movements']}")
@@ -486,6 +530,10 @@ class World:
         """停止模拟"""
         self.is_running = False
 
+    async def finish_reflections(self):
+        """等待所有智能体进行中的后台反思完成"""
+        await asyncio.gather(*(agent.wait_for_reflection() for agent in self.agents.values()))
+
     def get_simulation_stats(self) -> Dict[str, Any]:
         """获取模拟统计信息"""
         uptime = GameTime.minutes_since(self.stats["uptime_start"])
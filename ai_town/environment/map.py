@@ -8,6 +8,8 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Any, Dict, List, Optional, Tuple
 
+from ai_town.environment.spatial import SpatialGrid
+
 
 class TerrainType(Enum):
     """地形类型"""
@@ -333,12 +335,27 @@ class GameMap:
         return []
 
     def get_nearby_agents(
-        self, center_x: float, center_y: float, radius: float, agent_positions: Dict[str, Any]
+        self,
+        center_x: float,
+        center_y: float,
+        radius: float,
+        agent_positions: Dict[str, Any],
+        grid: Optional[SpatialGrid] = None,
     ) -> List[Dict[str, Any]]:
-        """获取指定范围内的其他智能体"""
+        """
+        获取指定范围内的其他智能体
+
+        Args:
+            grid: 以 agent_positions.items() 为 items 构建的空间索引；提供时只检查附近网格中的智能体
+        """
         nearby = []
 
-        for agent_id, agent_data in agent_positions.items():
+        if grid is not None:
+            entries = [grid.items[i] for i in grid.query(center_x, center_y, radius)]
+        else:
+            entries = agent_positions.items()
+
+        for agent_id, agent_data in entries:
             agent_x = agent_data.get("x", 0)
             agent_y = agent_data.get("y", 0)
 
@@ -0,0 +1,153 @@
+"""
+空间计算工具
+为感知、邻近查询等场景提供批量距离计算
+"""
+
+from itertools import chain
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba 为可选依赖，未安装时退化为普通 Python 函数
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """numba.njit 的空实现"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+# 候选数量低于该阈值时，逐个比较比构建数组更划算
+VECTORIZE_THRESHOLD = 32
+
+
+@njit(cache=True, fastmath=True)
+def within_range(ax: float, ay: float, bx: float, by: float, max_distance: float) -> bool:
+    """判断两点距离是否不超过 max_distance"""
+    return (ax - bx) ** 2 + (ay - by) ** 2 <= max_distance * max_distance
+
+
+@njit(cache=True)
+def update_energy_mood(energy: float, mood: float, state_delta: float) -> Tuple[float, float]:
+    """
+    按一个时间步推进能量与心情
+
+    Args:
+        energy: 当前能量（0-100）
+        mood: 当前心情（-1.0 到 1.0）
+        state_delta: 当前状态带来的额外能量变化（睡眠 +5，工作 -2 等）
+
+    Returns:
+        (新能量, 新心情)
+    """
+    energy = energy - 1.0 + state_delta  # 基础消耗 + 状态影响
+    energy = max(0.0, min(100.0, energy))
+
+    if energy < 20:
+        mood -= 0.1
+    elif energy > 80:
+        mood += 0.05
+
+    return energy, max(-1.0, min(1.0, mood))
+
+
+def positions_to_array(items: Sequence[Dict[str, Any]]) -> np.ndarray:
+    """将带有 x / y 字段的字典序列打包为 (N, 2) 坐标数组"""
+    count = len(items)
+    flat = np.fromiter(
+        chain.from_iterable((item["x"], item["y"]) for item in items),
+        dtype=np.float64,
+        count=count * 2,
+    )
+    return flat.reshape(count, 2)
+
+
+def within_radius_mask(
+    center_x: float, center_y: float, xy: np.ndarray, radius: Union[float, np.ndarray]
+) -> np.ndarray:
+    """
+    计算坐标数组中哪些点位于给定半径内
+
+    Args:
+        center_x, center_y: 中心点坐标
+        xy: (N, 2) 坐标数组
+        radius: 标量半径，或与 xy 等长的逐点半径数组
+
+    Returns:
+        长度为 N 的布尔掩码
+    """
+    diffs = xy - np.array((center_x, center_y), dtype=xy.dtype)
+    dist_sq = np.einsum("ij,ij->i", diffs, diffs)
+    return dist_sq <= np.square(radius)
+
+
+class SpatialGrid:
+    """
+    均匀网格空间索引
+
+    按 cell_size 把点划入网格单元，查询时只取与查询圆外接正方形相交的单元中的点，
+    结果是候选集合（可能包含略超出半径的点），调用方再做精确的距离判断。
+    """
+
+    def __init__(self, xy: np.ndarray, cell_size: float, items: Optional[Sequence[Any]] = None):
+        """
+        Args:
+            xy: (N, 2) 坐标数组
+            cell_size: 网格单元边长（通常取最大查询半径）
+            items: 与 xy 逐行对应的附带数据，供调用方按索引取用
+        """
+        self.xy = xy
+        self.items = items
+        self.cell_size = float(cell_size)
+
+        cells = np.floor(xy / self.cell_size).astype(np.int64)
+        if len(cells):
+            self._origin = cells.min(axis=0)
+            cells -= self._origin
+            self._shape = cells.max(axis=0) + 1
+        else:
+            self._origin = np.zeros(2, dtype=np.int64)
+            self._shape = np.zeros(2, dtype=np.int64)
+
+        # 按单元编号（列优先展开）排序，同一列中相邻单元的点在排序后连续
+        keys = cells[:, 0] * self._shape[1] + cells[:, 1]
+        self._order = np.argsort(keys, kind="stable")
+        self._sorted_keys = keys[self._order]
+
+    def __len__(self) -> int:
+        return len(self.xy)
+
+    def query(self, center_x: float, center_y: float, radius: float) -> np.ndarray:
+        """
+        返回可能位于半径内的点的索引（升序，即保持输入顺序）
+        """
+        if not len(self.xy):
+            return np.empty(0, dtype=np.int64)
+
+        lo = np.floor(np.array((center_x - radius, center_y - radius)) / self.cell_size)
+        hi = np.floor(np.array((center_x + radius, center_y + radius)) / self.cell_size)
+        lo = np.maximum(lo.astype(np.int64) - self._origin, 0)
+        hi = np.minimum(hi.astype(np.int64) - self._origin, self._shape - 1)
+        if (lo > hi).any():
+            return np.empty(0, dtype=np.int64)
+
+        # 每一列中 [lo_y, hi_y] 范围内的单元在排序后是一段连续区间
+        columns = np.arange(lo[0], hi[0] + 1) * self._shape[1]
+        starts = np.searchsorted(self._sorted_keys, columns + lo[1], side="left")
+        ends = np.searchsorted(self._sorted_keys, columns + hi[1], side="right")
+        if not (ends > starts).any():
+            return np.empty(0, dtype=np.int64)
+        candidates = np.concatenate([self._order[s:e] for s, e in zip(starts, ends)])
+        candidates.sort()
+        return candidates
+
+
+if NUMBA_AVAILABLE:
+    # 导入时预热编译，避免运行中首次调用的 JIT 延迟
+    within_range(0.0, 0.0, 1.0, 1.0, 1.0)
+    update_energy_mood(50.0, 0.0, 0.0)
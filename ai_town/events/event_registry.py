@@ -40,11 +40,14 @@ class EventRegistry:
 
     def __init__(self):
         self._events: Dict[str, EventMetadata] = {}
+        # 每次注册递增，供依赖事件元数据的缓存判断是否失效
+        self.version = 0
         self._register_default_events()
 
     def register_event(self, metadata: EventMetadata):
         """注册事件类型"""
         self._events[metadata.event_id] = metadata
+        self.version += 1
 
     def get_event_metadata(self, event_id: str) -> Optional[EventMetadata]:
         """获取事件元数据"""
@@ -15,6 +15,46 @@ import httpx
 
 logger = logging.getLogger(__name__)
 
+# 所有提供者共用的 HTTP 客户端：连接池与长连接在各提供者、各次调用间复用
+_shared_client: Optional[httpx.AsyncClient] = None
+
+# 同时进行中的 LLM 请求上限：大量智能体并发时避免压垮提供者或触发限流（429）
+LLM_CONCURRENCY = int(os.getenv("AITOWN_LLM_CONCURRENCY", "8"))
+_llm_semaphore: Optional[asyncio.Semaphore] = None
+_llm_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def llm_request_slot() -> asyncio.Semaphore:
+    """获取限制 LLM 并发请求数的信号量（按事件循环创建，每次请求占用一个名额）"""
+    global _llm_semaphore, _llm_semaphore_loop
+    loop = asyncio.get_running_loop()
+    if _llm_semaphore_loop is not loop:
+        _llm_semaphore = asyncio.Semaphore(LLM_CONCURRENCY)
+        _llm_semaphore_loop = loop
+    return _llm_semaphore
+
+
+def get_shared_http_client() -> httpx.AsyncClient:
+    """获取共享的 HTTP 客户端（首次使用或关闭后重新创建）"""
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = httpx.AsyncClient(
+            timeout=60.0,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        )
+    return _shared_client
+
+
+async def close_shared_http_client():
+    """关闭共享的 HTTP 客户端"""
+    global _shared_client
+    if _shared_client is not None:
+        client, _shared_client = _shared_client, None
+        try:
+            await client.aclose()
+        except Exception:
+            pass
+
 
 @dataclass
 class LLMResponse:
@@ -29,6 +69,11 @@ class LLMResponse:
 class LLMProvider(ABC):
     """LLM 提供者抽象基类"""
 
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP 客户端（所有提供者共享同一连接池）"""
+        return get_shared_http_client()
+
     @abstractmethod
     async def generate(self, prompt: str, context: Dict[str, Any] = None) -> LLMResponse:
         """生成文本响应"""
@@ -46,7 +91,6 @@ class OllamaProvider(LLMProvider):
     def __init__(self, model_name: str = "tinyllama", base_url: str = "http://localhost:11434"):
         self.model_name = model_name
         self.base_url = base_url
-        self.client = httpx.AsyncClient(timeout=60.0)
 
     async def generate(self, prompt: str, context: Dict[str, Any] = None) -> LLMResponse:
         """使用 Ollama 生成响应"""
@@ -92,12 +136,6 @@ class OllamaProvider(LLMProvider):
         prompt += "Assistant: "
         return await self.generate(prompt)
 
-    async def aclose(self):
-        try:
-            await self.client.aclose()
-        except Exception:
-            pass
-
 
 class OpenAIProvider(LLMProvider):
     """OpenAI API 提供者"""
@@ -105,9 +143,7 @@ class OpenAIProvider(LLMProvider):
     def __init__(self, api_key: str = None, model_name: str = "gpt-3.5-turbo"):
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         self.model_name = model_name
-        self.client = httpx.AsyncClient(
-            headers={"Authorization": f"Bearer {self.api_key}"}, timeout=60.0
-        )
+        self.headers = {"Authorization": f"Bearer {self.api_key}"}
 
     async def generate(self, prompt: str, context: Dict[str, Any] = None) -> LLMResponse:
         """使用 OpenAI API 生成响应"""
@@ -119,6 +155,7 @@ class OpenAIProvider(LLMProvider):
         try:
             response = await self.client.post(
                 "https://api.openai.com/v1/chat/completions",
+                headers=self.headers,
                 json={
                     "model": self.model_name,
                     "messages": messages,
@@ -142,12 +179,6 @@ class OpenAIProvider(LLMProvider):
             logger.error(f"OpenAI API error: {e}")
             return LLMResponse(content="[LLM Error: Connection failed]")
 
-    async def aclose(self):
-        try:
-            await self.client.aclose()
-        except Exception:
-            pass
-
 
 class MockLLMProvider(LLMProvider):
     """模拟 LLM 提供者（用于测试和演示）"""
@@ -207,9 +238,7 @@ class DeepSeekProvider(LLMProvider):
         self.api_key = api_key
         self.model_name = model_name
         self.base_url = base_url.rstrip("/")
-        self.client = httpx.AsyncClient(
-            headers={"Authorization": f"Bearer {self.api_key}"}, timeout=60.0
-        )
+        self.headers = {"Authorization": f"Bearer {self.api_key}"}
 
     async def generate(self, prompt: str, context: Dict[str, Any] = None) -> LLMResponse:
         messages = [{"role": "user", "content": prompt}]
@@ -220,6 +249,7 @@ class DeepSeekProvider(LLMProvider):
             url = f"{self.base_url}/v1/chat/completions"
             response = await self.client.post(
                 url,
+                headers=self.headers,
                 json={
                     "model": self.model_name,
                     "messages": messages,
@@ -241,12 +271,6 @@ class DeepSeekProvider(LLMProvider):
             logger.error(f"DeepSeek API error: {e}")
             return LLMResponse(content="[LLM Error: Connection failed]")
 
-    async def aclose(self):
-        try:
-            await self.client.aclose()
-        except Exception:
-            pass
-
 
 class KimiProvider(LLMProvider):
     """Kimi(Moonshot) 提供商（OpenAI 兼容风格）"""
@@ -260,9 +284,7 @@ class KimiProvider(LLMProvider):
         self.api_key = api_key
         self.model_name = model_name
         self.base_url = base_url.rstrip("/")
-        self.client = httpx.AsyncClient(
-            headers={"Authorization": f"Bearer {self.api_key}"}, timeout=60.0
-        )
+        self.headers = {"Authorization": f"Bearer {self.api_key}"}
 
     async def generate(self, prompt: str, context: Dict[str, Any] = None) -> LLMResponse:
         messages = [{"role": "user", "content": prompt}]
@@ -273,6 +295,7 @@ class KimiProvider(LLMProvider):
             url = f"{self.base_url}/v1/chat/completions"
             response = await self.client.post(
                 url,
+                headers=self.headers,
                 json={
                     "model": self.model_name,
                     "messages": messages,
@@ -294,12 +317,6 @@ class KimiProvider(LLMProvider):
             logger.error(f"Kimi API error: {e}")
             return LLMResponse(content="[LLM Error: Connection failed]")
 
-    async def aclose(self):
-        try:
-            await self.client.aclose()
-        except Exception:
-            pass
-
 
 class QwenProvider(LLMProvider):
     """Qwen 通义千问提供商（DashScope 兼容模式）"""
@@ -313,9 +330,7 @@ class QwenProvider(LLMProvider):
         self.api_key = api_key
         self.model_name = model_name
         self.base_url = base_url.rstrip("/")
-        self.client = httpx.AsyncClient(
-            headers={"Authorization": f"Bearer {self.api_key}"}, timeout=60.0
-        )
+        self.headers = {"Authorization": f"Bearer {self.api_key}"}
 
     async def generate(self, prompt: str, context: Dict[str, Any] = None) -> LLMResponse:
         messages = [{"role": "user", "content": prompt}]
@@ -326,6 +341,7 @@ class QwenProvider(LLMProvider):
             url = f"{self.base_url}/v1/chat/completions"
             response = await self.client.post(
                 url,
+                headers=self.headers,
                 json={
                     "model": self.model_name,
                     "messages": messages,
@@ -347,12 +363,6 @@ class QwenProvider(LLMProvider):
             logger.error(f"Qwen API error: {e}")
             return LLMResponse(content="[LLM Error: Connection failed]")
 
-    async def aclose(self):
-        try:
-            await self.client.aclose()
-        except Exception:
-            pass
-
 
 class LLMManager:
     """LLM 管理器 - 管理多个 LLM 提供者"""
@@ -372,10 +382,8 @@ class LLMManager:
         """设置故障转移链"""
         self.fallback_providers = provider_names
 
-    async def generate(
-        self, prompt: str, provider_name: str = None, context: Dict[str, Any] = None
-    ) -> LLMResponse:
-        """生成响应（支持故障转移）"""
+    def _providers_to_try(self, provider_name: str = None) -> List[str]:
+        """按 指定提供者 -> 默认提供者 -> 故障转移链 的顺序列出可用提供者（去重）"""
         providers_to_try = []
 
         if provider_name and provider_name in self.providers:
@@ -387,43 +395,41 @@ class LLMManager:
         providers_to_try.extend(self.fallback_providers)
 
         # 去重并保持顺序
-        providers_to_try = list(dict.fromkeys(providers_to_try))
+        return [name for name in dict.fromkeys(providers_to_try) if name in self.providers]
 
-        for provider_name in providers_to_try:
-            if provider_name in self.providers:
-                try:
+    @staticmethod
+    def _is_usable(response: LLMResponse) -> bool:
+        """响应是否有效（非空且不是错误占位）"""
+        return bool(response.content) and not response.content.startswith("[LLM Error")
+
+    async def generate(
+        self, prompt: str, provider_name: str = None, context: Dict[str, Any] = None
+    ) -> LLMResponse:
+        """生成响应（支持故障转移）"""
+        for provider_name in self._providers_to_try(provider_name):
+            try:
+                async with llm_request_slot():
                     response = await self.providers[provider_name].generate(prompt, context)
-                    if response.content and not response.content.startswith("[LLM Error"):
-                        return response
-                except Exception as e:
-                    logger.warning(f"Provider {provider_name} failed: {e}")
-                    continue
+                if self._is_usable(response):
+                    return response
+            except Exception as e:
+                logger.warning(f"Provider {provider_name} failed: {e}")
+                continue
 
         # 所有提供者都失败了
         return LLMResponse(content="[LLM 提供者都不可用]")
 
     async def chat(self, messages: List[Dict[str, str]], provider_name: str = None) -> LLMResponse:
         """对话模式（支持故障转移）"""
-        providers_to_try = []
-
-        if provider_name and provider_name in self.providers:
-            providers_to_try.append(provider_name)
-
-        if self.default_provider:
-            providers_to_try.append(self.default_provider)
-
-        providers_to_try.extend(self.fallback_providers)
-        providers_to_try = list(dict.fromkeys(providers_to_try))
-
-        for provider_name in providers_to_try:
-            if provider_name in self.providers:
-                try:
+        for provider_name in self._providers_to_try(provider_name):
+            try:
+                async with llm_request_slot():
                     response = await self.providers[provider_name].chat(messages)
-                    if response.content and not response.content.startswith("[LLM Error"):
-                        return response
-                except Exception as e:
-                    logger.warning(f"Provider {provider_name} failed: {e}")
-                    continue
+                if self._is_usable(response):
+                    return response
+            except Exception as e:
+                logger.warning(f"Provider {provider_name} failed: {e}")
+                continue
 
         return LLMResponse(content="[LLM 提供者都不可用]")
 
@@ -440,6 +446,7 @@ class LLMManager:
                     await aclose()
                 except Exception:
                     pass
+        await close_shared_http_client()
 
 
 # 全局 LLM 管理器实例
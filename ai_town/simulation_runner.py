@@ -103,6 +103,9 @@ async def main():
         print(f"\n⏹️ 模拟已中断")
         world.stop_simulation()
 
+    # 等待后台反思完成，使洞察写入记忆后再统计与保存
+    await world.finish_reflections()
+
     # 显示最终统计
     print(f"\n📈 最终统计:")
     stats = world.get_simulation_stats()
@@ -194,6 +194,9 @@ class VisualizationManager:
                 # 置空引用，防止重复操作同一任务
                 self.simulation_task = None
 
+        # 等待后台反思完成，避免洞察丢失
+        await self.world.finish_reflections()
+
         await self.broadcast_message(
             {"type": "simulation_paused", "data": {"message": "模拟已暂停"}}
         )
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+AI Town 智能体管理器与观察对象池测试
+"""
+
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+
+def test_agent_manager_position_store():
+    """测试 AgentManager 的集中坐标存储"""
+    from ai_town.agents.agent_manager import AgentManager
+    from ai_town.agents.base_agent import Position, PositionView
+
+    manager = AgentManager()
+    alice = manager.create_agent("alice")
+    bob = manager.create_agent("bob")
+    assert isinstance(alice.position, PositionView), "受管智能体的位置应为存储视图"
+
+    alice.position.shift(1.0, -1.0)
+    assert (alice.position.x, alice.position.y) == (26.0, 24.0), "平移应写入共享存储"
+    assert manager._positions[manager._pos_index["alice"]].tolist() == [26.0, 24.0]
+
+    alice.position = Position(35, 20, "bookstore")
+    assert manager.get_agents_by_area("bookstore") == [bob, alice], "按区域查询应反映最新位置"
+    assert manager.get_agents_by_area("coffee_shop") == [], "离开的区域不应再包含该智能体"
+    assert manager.get_agents_within(35, 20, 0.5) == [alice, bob], "范围查询应包含两人"
+
+    assert manager.remove_agent("alice"), "应能移除智能体"
+    assert type(alice.position) is Position, "移除后应还原为独立位置"
+    assert alice.position == Position(35, 20, "bookstore"), "还原的位置应保持原值"
+    assert manager.get_agents_by_area("bookstore") == [bob], "移除后不应再被查询到"
+
+    bob.occupation = "writer"
+    assert manager.get_agents_by_occupation("writer") == [bob], "职业变化应同步到索引"
+    assert manager.get_agents_by_occupation("bookstore_owner") == [], "旧职业不应再包含该智能体"
+
+
+def test_observation_pool_reuse():
+    """测试观察对象池的复用与字段重置"""
+    from ai_town.agents.base_agent import ObservationPool, Position
+
+    pool = ObservationPool(max_size=1)
+    first = pool.acquire(None, "alice", "agent_nearby", "desc", Position(0, 0), ["bob"], 2.0)
+    participants = first.participants
+    pool.release(first)
+    assert participants == ["bob"], "归还对象不应清空已被记忆引用的列表"
+
+    second = pool.acquire(None, "alice", "reflection", "insight", Position(1, 1))
+    assert second is first, "归还的对象应被复用"
+    assert (second.participants, second.metadata, second.importance) == (
+        [],
+        {},
+        1.0,
+    ), "复用对象应重置为默认值"
@@ -1,6 +1,6 @@
 """
 测试 LLM 增强智能体的功能
-验证 Alice、Bob、Charlie 是否正确升级为 LLM 驱动的智能体
+验证 Alice、Bob、Charlie 是否正确升级为 LLM 驱动的智能体，以及 LLM 调用的批量、缓存与并发限制
 """
 
 import asyncio
@@ -144,5 +144,157 @@ async def test_llm_agents():
     print("=" * 50)
 
 
+@pytest.mark.asyncio
+async def test_llm_conversation_reply_cache(monkeypatch):
+    """测试重复消息复用缓存的 LLM 回应，人设变化后缓存作废"""
+    import ai_town.agents.llm_enhanced_agent as llm_enhanced_agent
+
+    calls = []
+
+    async def _fake_chat(messages, provider=None):
+        calls.append(messages[-1]["content"])
+        return f"回应{len(calls)}"
+
+    monkeypatch.setattr(llm_enhanced_agent, "chat_with_llm", _fake_chat)
+    bob = Bob()
+
+    first = await bob._llm_respond_to_conversation("Alice", "Hi there")
+    again = await bob._llm_respond_to_conversation("Alice", "Hi there")
+    assert (first, again) == ("回应1", "回应2"), "对话历史变化后相同消息应重新生成"
+
+    # 新的一段对话：历史与第一次相同，归一化后相同的消息复用缓存
+    bob.conversation_history["Alice"] = []
+    assert await bob._llm_respond_to_conversation("Alice", "  hi THERE ") == "回应1"
+    assert len(calls) == 2, "缓存命中时不应再调用 LLM"
+    assert len(bob.conversation_history["Alice"]) == 2, "缓存命中也应记录对话历史"
+
+    await bob._llm_respond_to_conversation("Charlie", "Hi there")
+    assert len(calls) == 3, "不同对话对象不应共享缓存"
+
+    bob.occupation = "writer"
+    bob.conversation_history["Alice"] = []
+    assert (
+        await bob._llm_respond_to_conversation("Alice", "Hi there") == "回应4"
+    ), "人设变化后应重新生成"
+
+
+@pytest.mark.asyncio
+async def test_llm_decision_cache(monkeypatch):
+    """测试同一小时、同一区域且重要记忆相同的情境复用 LLM 决策"""
+    import ai_town.agents.llm_enhanced_agent as llm_enhanced_agent
+
+    calls = []
+
+    async def _fake_chat(messages, provider=None):
+        calls.append(messages[-1]["content"])
+        return '{"type": "work", "description": "整理书架", "reason": "工作时间"}'
+
+    monkeypatch.setattr(llm_enhanced_agent, "chat_with_llm", _fake_chat)
+    bob = Bob()
+
+    context = {
+        "current_time": "2024-01-01 09:05:00",
+        "position": {"x": 0, "y": 0, "area": "bookstore"},
+        "recent_memories": ["整理了新书"],
+    }
+    first = await bob._llm_decide_action(context)
+    first["type"] = "modified"
+    second = await bob._llm_decide_action({**context, "current_time": "2024-01-01 09:40:00"})
+    assert second["type"] == "work", "缓存的决策不应被调用方修改影响"
+    assert len(calls) == 1, "同一小时内的相同情境应复用决策"
+
+    await bob._llm_decide_action({**context, "current_time": "2024-01-01 10:05:00"})
+    assert len(calls) == 2, "跨小时后应重新决策"
+
+    # 记忆部分按重要性量化：日常观察不影响命中，新的重要记忆才会重新决策
+    def _live_context():
+        return {**bob._build_decision_context(), "current_time": "2024-01-01 11:05:00"}
+
+    await bob._llm_decide_action(_live_context())
+    bob.memory.add_observation(
+        Observation(
+            timestamp=GameTime.now(),
+            observer_id=bob.agent_id,
+            event_type="agent_nearby",
+            description="看到 Alice 路过",
+            location=Position(0.0, 0.0),
+            importance=2.0,
+        )
+    )
+    await bob._llm_decide_action(_live_context())
+    assert len(calls) == 3, "低重要性的观察不应使决策缓存失效"
+
+    bob.memory.add_reflection("书店的房租要上涨了")
+    await bob._llm_decide_action(_live_context())
+    assert len(calls) == 4, "新的重要记忆应触发重新决策"
+
+    # 人设的任何部分变化都会作废缓存
+    bob.background = "刚从外地搬来的书店老板。"
+    await bob._llm_decide_action(_live_context())
+    assert len(calls) == 5, "背景变化后应重新决策"
+    assert "刚从外地搬来" in bob._static_persona, "人设文本应随背景更新"
+
+
+@pytest.mark.asyncio
+async def test_llm_requests_respect_concurrency_limit(monkeypatch):
+    """测试并发的 LLM 请求数不超过 AITOWN_LLM_CONCURRENCY 限制"""
+    from ai_town.llm import llm_integration
+    from ai_town.llm.llm_integration import LLMManager, LLMProvider, LLMResponse
+
+    monkeypatch.setattr(llm_integration, "LLM_CONCURRENCY", 3)
+    monkeypatch.setattr(llm_integration, "_llm_semaphore_loop", None)
+
+    in_flight = []
+    peak = []
+
+    class SlowProvider(LLMProvider):
+        async def generate(self, prompt, context=None):
+            in_flight.append(prompt)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(prompt)
+            return LLMResponse(content=prompt)
+
+        async def chat(self, messages):
+            return await self.generate(messages[-1]["content"])
+
+    manager = LLMManager()
+    manager.register_provider("slow", SlowProvider())
+
+    results = await asyncio.gather(*(manager.generate(f"p{i}") for i in range(20)))
+
+    assert [r.content for r in results] == [f"p{i}" for i in range(20)], "结果应与请求一一对应"
+    assert max(peak) == 3, "同时进行中的请求数应达到且不超过上限"
+
+
+@pytest.mark.asyncio
+async def test_fallback_responses_share_one_rule_table(monkeypatch):
+    """测试不使用 LLM 时与 LLM 调用失败时，回应都来自同一张回退规则表"""
+    import ai_town.agents.llm_enhanced_agent as llm_enhanced_agent
+
+    async def _failing_chat(messages, provider=None):
+        raise RuntimeError("模拟 LLM 故障")
+
+    monkeypatch.setattr(llm_enhanced_agent, "chat_with_llm", _failing_chat)
+
+    for agent_class, message in ((Alice, "今天的咖啡"), (Bob, "想找本书"), (Charlie, "工作忙吗")):
+        agent = agent_class()
+        _, candidates = next(
+            rule for rule in agent._compiled_response_rules if rule[0].search(message)
+        )
+        assert await agent.respond_to_conversation("Dana", message) in candidates
+
+        agent.use_llm_for_conversation = False
+        assert await agent.respond_to_conversation("Dana", message) in candidates
+
+
+def test_alice_favorite_topics_is_class_constant():
+    """测试 Alice 的喜爱话题是类级常量，对话风格直接引用它"""
+    alice = Alice()
+    with pytest.raises(AttributeError):
+        alice.favorite_topics = ("music",)
+    assert alice.get_conversation_style()["topics"] is Alice.favorite_topics
+
+
 if __name__ == "__main__":
     asyncio.run(test_llm_agents())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+AI Town 记忆流与洞察规则测试
+"""
+
+import random
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+
+def test_memory_column_queries_match_list_scan():
+    """测试记忆流列式筛选与逐条扫描结果一致（含时间 / 重要性相同的情况）"""
+    from datetime import timedelta
+
+    from ai_town.agents.base_agent import Observation, Position
+    from ai_town.agents.memory.memory_stream import MemoryStream
+    from ai_town.core.time_manager import GameTime
+
+    rng = random.Random(3)
+    stream = MemoryStream("columns_test")
+    now = GameTime.now()
+    for i in range(300):
+        stream.add_observation(
+            Observation(
+                timestamp=now - timedelta(hours=rng.choice([0, 0.5, 1.5, 2.5, 30.5, 50.5])),
+                observer_id="columns_test",
+                event_type="test",
+                description=f"memory {i}",
+                location=Position(0.0, 0.0),
+                importance=float(rng.randint(1, 10)),
+            )
+        )
+        if i % 7 == 0:
+            stream.add_reflection(f"insight {i}", importance=float(rng.randint(5, 9)))
+
+    all_memories = stream.observations + stream.reflections
+    for hours_back in (1, 3, 24, 72):
+        cutoff = GameTime.now() - timedelta(hours=hours_back)
+        expected = sorted(
+            (m for m in all_memories if m.timestamp >= cutoff),
+            key=lambda m: m.timestamp,
+            reverse=True,
+        )[:50]
+        assert stream.get_recent_memories(hours_back) == expected, "最近记忆筛选结果应一致"
+        assert stream.get_recent_descriptions(hours_back) == tuple(
+            m.description for m in expected
+        ), "最近记忆描述应与最近记忆一致"
+
+        expected = sorted(
+            (m for m in all_memories if m.timestamp >= cutoff and m.importance >= 6.0),
+            key=lambda m: m.importance,
+            reverse=True,
+        )
+        assert (
+            stream.get_memories_by_importance(6.0, hours_back) == expected
+        ), "重要记忆筛选结果应一致"
+
+
+def test_insight_rules_match_keyword_masks():
+    """测试按写入时编码的关键词位掩码匹配洞察规则，结果与逐条子串匹配一致"""
+    from ai_town.agents.base_agent import Observation, Position
+    from ai_town.agents.characters import Alice
+    from ai_town.core.time_manager import GameTime
+
+    agent = Alice()
+    descriptions = [
+        "Served a Customer at the coffee_shop",
+        "Had a long chat with Bob",
+        "Talked about coffee beans",
+        "Finished work early",
+        "Went for a walk",
+    ] * 2
+    for description in descriptions:
+        agent.memory.add_observation(
+            Observation(
+                timestamp=GameTime.now(),
+                observer_id=agent.agent_id,
+                event_type="test",
+                description=description,
+                location=Position(0.0, 0.0),
+            )
+        )
+
+    recent = agent.memory.observations[-len(descriptions) :]
+    # 少量记忆走逐条路径，较多记忆走数组路径
+    for memories in (recent, recent * 4):
+        expected = [
+            insight
+            for keywords, min_count, insight in agent._INSIGHT_RULES
+            if sum(any(k in m.description.lower() for k in keywords) for m in memories) >= min_count
+        ]
+        assert expected, "测试数据应至少满足一条洞察规则"
+        assert agent._match_insight_rules(memories) == expected, "位掩码匹配结果应与子串匹配一致"
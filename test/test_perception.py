@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+AI Town 感知与空间计算测试
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+
+def _make_agent():
+    from ai_town.agents.agent_manager import AgentManager
+
+    agent = AgentManager().create_agent("alice")
+    assert agent is not None, "应该能创建 Alice"
+    return agent
+
+
+def _random_world_state(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    nearby_agents = [
+        {
+            "id": f"npc_{i}",
+            "name": f"NPC{i}",
+            "x": rng.uniform(-10, 10),
+            "y": rng.uniform(-10, 10),
+            "area": "street",
+        }
+        for i in range(count)
+    ]
+    events = [
+        {
+            "type": rng.choice(["conversation", "movement", "activity", "other"]),
+            "description": f"event {i}",
+            "x": rng.uniform(-10, 10),
+            "y": rng.uniform(-10, 10),
+        }
+        for i in range(count)
+    ]
+    return {"nearby_agents": nearby_agents, "events": events}
+
+
+@pytest.mark.asyncio
+async def test_vectorized_perception_matches_scalar():
+    """测试向量化感知与逐个比较的结果一致"""
+    from ai_town.agents.base_agent import Position
+
+    agent = _make_agent()
+    agent.position = Position(0.0, 0.0, "street")
+
+    large = _random_world_state(200)
+
+    # 小规模走逐个比较路径，作为参照
+    expected = []
+    for start in range(0, 200, 8):
+        chunk = {
+            "nearby_agents": large["nearby_agents"][start : start + 8],
+            "events": large["events"][start : start + 8],
+        }
+        expected.extend(await agent._perceive(chunk))
+    actual = await agent._perceive(large)
+
+    def _key(obs):
+        return (obs.event_type, obs.description)
+
+    assert sorted(map(_key, actual)) == sorted(
+        map(_key, expected)
+    ), "向量化感知结果应与逐个比较一致"
+
+
+def test_within_radius_mask():
+    """测试半径掩码计算"""
+    import numpy as np
+
+    from ai_town.environment.spatial import positions_to_array, within_radius_mask
+
+    xy = positions_to_array([{"x": 0, "y": 3}, {"x": 4, "y": 3}, {"x": 1, "y": 1}])
+    mask = within_radius_mask(0.0, 0.0, xy, 5.0)
+    assert mask.tolist() == [True, True, True], "边界上的点应视为在范围内"
+
+    mask = within_radius_mask(0.0, 0.0, xy, np.array([2.0, 5.0, 1.0]))
+    assert mask.tolist() == [False, True, False], "逐点半径应分别生效"
+
+
+@pytest.mark.asyncio
+async def test_reflection_runs_in_background(monkeypatch):
+    """测试反思在后台执行，不阻塞时间步，且进行中不会重复发起"""
+    import asyncio
+
+    agent = _make_agent()
+    started = []
+    release = asyncio.Event()
+
+    async def _slow_insights(self, memories):
+        started.append(True)
+        await release.wait()
+        return ["后台反思得到的洞察"]
+
+    monkeypatch.setattr(type(agent), "_generate_insights", _slow_insights)
+    world_state = {"nearby_agents": [], "events": []}
+
+    agent.memory.importance_sum = agent.memory.reflection_threshold
+    await agent.step(world_state)
+    task = agent._reflection_task
+    assert task is not None and not task.done(), "反思应在后台进行，不阻塞时间步"
+    assert not agent.memory.should_reflect(), "发起反思后应重置重要性累计"
+
+    agent.memory.importance_sum = agent.memory.reflection_threshold
+    await agent.step(world_state)
+    assert agent._reflection_task is task, "上一次反思未完成时不应重复发起"
+
+    release.set()
+    await task
+    assert len(started) == 1, "只应执行一次反思"
+    assert any(
+        m.description == "后台反思得到的洞察" for m in agent.memory.observations
+    ), "反思洞察应在完成后写入记忆"
+
+
+@pytest.mark.asyncio
+async def test_reflection_insight_lands_on_later_tick(monkeypatch):
+    """测试后台反思的洞察在后续时间步写入记忆，且停止模拟时会等待进行中的反思"""
+    import asyncio
+
+    from ai_town.core.world import World
+
+    agent = _make_agent()
+    world = World()
+    world.add_agent(agent)
+    gates = [asyncio.Event(), asyncio.Event()]
+
+    async def _gated_insights(self, memories):
+        gate = gates[0] if not gates[0].is_set() else gates[1]
+        await gate.wait()
+        return [f"第 {gates.index(gate) + 1} 次反思的洞察"]
+
+    monkeypatch.setattr(type(agent), "_generate_insights", _gated_insights)
+
+    def _has_insight(text):
+        return any(m.description == text for m in agent.memory.observations)
+
+    agent.memory.importance_sum = agent.memory.reflection_threshold
+    await world.step()
+    assert not _has_insight("第 1 次反思的洞察"), "反思未完成时洞察不应出现"
+
+    gates[0].set()
+    await world.step()
+    assert agent._reflection_task.done(), "反思应在后续时间步中完成"
+    assert _has_insight("第 1 次反思的洞察"), "洞察应在后续时间步写入记忆"
+
+    # 停止模拟时仍在进行的反思应被等待完成，而不是随事件循环退出而丢失
+    agent.memory.importance_sum = agent.memory.reflection_threshold
+    await world.step()
+    pending = agent._reflection_task
+    assert not pending.done(), "第二次反思应在后台进行"
+    asyncio.get_running_loop().call_soon(gates[1].set)
+    await world.finish_reflections()
+    assert pending.done(), "finish_reflections 应等待进行中的反思"
+    assert _has_insight("第 2 次反思的洞察"), "停止前的反思洞察不应丢失"
+
+
+def test_spatial_grid_nearby_agents_match_linear_scan():
+    """测试基于空间网格的邻近查询与逐个扫描结果一致"""
+    from ai_town.environment.map import GameMap
+    from ai_town.environment.spatial import SpatialGrid, positions_to_array
+
+    rng = random.Random(11)
+    agent_positions = {
+        f"npc_{i}": {
+            "id": f"npc_{i}",
+            "name": f"NPC{i}",
+            "x": rng.uniform(0, 100),
+            "y": rng.uniform(0, 100),
+        }
+        for i in range(300)
+    }
+    grid = SpatialGrid(
+        positions_to_array(list(agent_positions.values())), 5.0, items=list(agent_positions.items())
+    )
+    game_map = GameMap()
+
+    for _ in range(50):
+        x, y = rng.uniform(-10, 110), rng.uniform(-10, 110)
+        radius = rng.choice([0.5, 2.0, 5.0, 12.0])
+        expected = game_map.get_nearby_agents(x, y, radius, agent_positions)
+        actual = game_map.get_nearby_agents(x, y, radius, agent_positions, grid)
+        assert actual == expected, "网格查询结果（含顺序）应与逐个扫描一致"